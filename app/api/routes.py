@@ -45,7 +45,7 @@
 #         if len(file_content) > settings.MAX_FILE_SIZE:
 #             raise HTTPException(status_code=413, detail="File too large")
         
-#         start_time = time.time()
+#         start_ns = time.perf_counter_ns()
         
 #         # Extract text
 #         text, extraction_method = await text_extractor.extract_text(
@@ -75,7 +75,7 @@
 #                 # Continue with rule-based result
         
 #         # Set processing time
-#         parsed_resume.processing_time = time.time() - start_time
+#         parsed_resume.processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
 #         # Cache result
 #         await cache_service.cache_result(text, parsed_resume.model_dump())
@@ -173,71 +173,229 @@
 
 
 import asyncio
+import hashlib
+import logging
+import re
+import tempfile
 import time
 import uuid
-from datetime import datetime
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends
 from fastapi.responses import JSONResponse
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from ..models.resume_models import ParseResponse, JobStatus, ParsedResume
-from ..services.text_extractor import TextExtractor
+from ..services.text_extractor import TextExtractor, get_text_extractor
 from ..services.rule_based_parser import RuleBasedParser
-from ..services.llm_parser import LLMParser
+from ..services.llm_parser import LLMParser, classify_llm_error
+from ..services.cache_service import CacheService
 from ..config import settings
 
 router = APIRouter()
+logger = logging.getLogger("resume_parser")
 
 # Initialize services
-text_extractor = TextExtractor()
 rule_parser = RuleBasedParser()
 llm_parser = LLMParser()
+cache_service = CacheService()
+
+_EXT_RE = re.compile(r"\.([^.]+)$")
+_SUPPORTED_FORMATS = frozenset(settings.SUPPORTED_FORMATS)
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+SPOOL_MAX_SIZE = 2 << 20  # Roll over to disk above 2MB
+
+def _file_extension(filename: str) -> str:
+    """Lowercased extension of a filename, or an empty string"""
+    match = _EXT_RE.search(filename or "")
+    return match.group(1).lower() if match else ""
+
+class ParseCoordinator:
+    """Lets concurrent requests for the same text await one in-flight parse (singleflight)"""
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def run(self, key: str, parse: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            # Shielded so one impatient client can't cancel the parse for everyone
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await parse()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unshared failure isn't reported as never retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+parse_coordinator = ParseCoordinator()
+
+async def spool_and_hash(
+    file: UploadFile, max_size: int
+) -> Tuple[tempfile.SpooledTemporaryFile, str]:
+    """Stream an upload into a spooled temp file, hashing it in the same pass"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    digest = hashlib.blake2b(digest_size=16)
+    total = 0
+    
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > max_size:
+                raise HTTPException(status_code=413, detail="File too large")
+            digest.update(chunk)
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
+
+async def _parse_text(
+    text: str, text_hash: str, use_llm_fallback: bool, llm_provider: str, race: bool
+) -> Tuple[ParsedResume, bool]:
+    """Rule-based parse with tiered LLM fallback, also reporting whether a needed LLM call failed"""
+    # A retry after a failed LLM call reuses the earlier rule-based result
+    rule_key = cache_service.rule_key(text_hash)
+    cached_rule_result = await cache_service.get_cached_result(rule_key)
+    if cached_rule_result:
+        parsed_resume = ParsedResume.model_validate_json(cached_rule_result)
+        confidence = parsed_resume.confidence_score
+    else:
+        # Regex/NLP work is CPU-bound, keep it off the event loop
+        parsed_resume, confidence = await asyncio.get_running_loop().run_in_executor(
+            None, rule_parser.parse, text
+        )
+    
+    needs_llm = use_llm_fallback and confidence < settings.LLM_SKIP_THRESHOLD
+    llm_failed = False
+    if needs_llm and not cached_rule_result:
+        await cache_service.cache_result([rule_key], parsed_resume.model_dump_json())
+    
+    if needs_llm:
+        if confidence < settings.LLM_FULL_THRESHOLD:
+            run_llm = lambda: llm_parser.parse(text, llm_provider, race)
+        else:
+            # Grey zone: only the sections the rule parser struggled with go to the LLM
+            weak_sections = [
+                section for section, section_confidence in rule_parser.section_confidences(parsed_resume).items()
+                if section_confidence < settings.RULE_CONFIDENCE_THRESHOLD
+            ]
+            run_llm = lambda: llm_parser.parse_sections(text, parsed_resume, weak_sections, llm_provider, race)
+        
+        # Connection blips get one retry; rate limits were already backed off inside the parser
+        for attempt in range(2):
+            try:
+                llm_resume, llm_confidence = await run_llm()
+            except Exception as e:
+                error_kind = classify_llm_error(e)
+                if error_kind == "connection" and attempt == 0:
+                    logger.warning("LLM connection failed, retrying: %s", e)
+                    continue
+                logger.warning("LLM fallback failed (%s): %s", error_kind, e)
+                llm_failed = True
+                break
+            
+            if llm_confidence > confidence:
+                parsed_resume = llm_resume
+            break
+    
+    return parsed_resume, llm_failed
+
+async def _parse_upload(
+    file: UploadFile,
+    use_llm_fallback: bool,
+    llm_provider: str,
+    race: bool,
+    text_extractor: TextExtractor
+) -> ParsedResume:
+    """Validate, extract and parse one uploaded resume, going through every cache layer"""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    file_extension = _file_extension(file.filename)
+    if file_extension not in _SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file format. Supported: {settings.SUPPORTED_FORMATS}"
+        )
+    
+    start_ns = time.perf_counter_ns()
+    
+    # Size is known once the multipart body is parsed, skip spooling when it's already too big
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+    
+    spooled_file, file_hash = await spool_and_hash(file, settings.MAX_FILE_SIZE)
+    options = cache_service.parse_options(use_llm_fallback, llm_provider, race)
+    try:
+        # Identical uploads with the same options skip extraction and parsing entirely
+        raw_key = cache_service.raw_key(file_hash, options)
+        cached_result = await cache_service.get_cached_result(raw_key)
+        if cached_result:
+            parsed_resume = ParsedResume.model_validate_json(cached_result)
+            parsed_resume.processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+            return parsed_resume
+        
+        text, extraction_method = await text_extractor.extract_text(
+            spooled_file, file.filename
+        )
+    finally:
+        spooled_file.close()
+    
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="No text could be extracted from file")
+    
+    # Same text from a different file (e.g. re-exported PDF)
+    text_hash = cache_service.text_hash(text)
+    text_key = cache_service.text_key(text_hash, options)
+    cached_result = await cache_service.get_cached_result(text_key)
+    if cached_result:
+        await cache_service.cache_result([raw_key], cached_result)
+        parsed_resume = ParsedResume.model_validate_json(cached_result)
+        parsed_resume.processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+        return parsed_resume
+    
+    # Concurrent uploads of the same text and options share a single parse
+    parsed_resume, llm_failed = await parse_coordinator.run(
+        text_key,
+        lambda: _parse_text(text, text_hash, use_llm_fallback, llm_provider, race)
+    )
+    # Waiters share the result object, so each request stamps its own copy
+    parsed_resume = parsed_resume.model_copy()
+    parsed_resume.processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+    
+    # A rule-only result left by a failed LLM call isn't cached, so a retry goes back to the LLM
+    if not llm_failed:
+        await cache_service.cache_result([raw_key, text_key], cache_service.serialize(parsed_resume))
+    return parsed_resume
 
 @router.post("/parse", response_model=ParseResponse)
 async def parse_resume_sync(
     file: UploadFile = File(...),
     use_llm_fallback: bool = True,
-    llm_provider: str = "openai"
+    llm_provider: str = "openai",
+    race: bool = False,
+    text_extractor: TextExtractor = Depends(get_text_extractor)
 ):
     """
-    Synchronous resume parsing endpoint
+    Synchronous resume parsing endpoint. With race=true every configured
+    LLM provider is queried and the first successful answer wins.
     """
     try:
-        if not file.filename:
-            raise HTTPException(status_code=400, detail="No file provided")
-        
-        file_extension = file.filename.split('.')[-1].lower()
-        if file_extension not in settings.SUPPORTED_FORMATS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file format. Supported: {settings.SUPPORTED_FORMATS}"
-            )
-        
-        file_content = await file.read()
-        if len(file_content) > settings.MAX_FILE_SIZE:
-            raise HTTPException(status_code=413, detail="File too large")
-        
-        start_time = time.time()
-        
-        text, extraction_method = await text_extractor.extract_text(
-            file_content, file.filename
-        )
-        
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No text could be extracted from file")
-        
-        parsed_resume, confidence = rule_parser.parse(text)
-        
-        if confidence < settings.RULE_CONFIDENCE_THRESHOLD and use_llm_fallback:
-            try:
-                llm_resume, llm_confidence = await llm_parser.parse(text, llm_provider)
-                if llm_confidence > confidence:
-                    parsed_resume = llm_resume
-            except Exception as e:
-                print(f"LLM fallback failed: {e}")
-        
-        parsed_resume.processing_time = time.time() - start_time
-        
+        parsed_resume = await _parse_upload(file, use_llm_fallback, llm_provider, race, text_extractor)
         return ParseResponse(success=True, data=parsed_resume)
         
     except HTTPException:
@@ -248,6 +406,33 @@ async def parse_resume_sync(
             error=f"Processing failed: {str(e)}"
         )
 
+@router.post("/parse/bulk", response_model=List[ParseResponse])
+async def parse_resume_bulk(
+    files: List[UploadFile] = File(...),
+    use_llm_fallback: bool = True,
+    llm_provider: str = "openai",
+    race: bool = False,
+    text_extractor: TextExtractor = Depends(get_text_extractor)
+):
+    """
+    Parse several resumes in one request. Files are parsed concurrently and
+    one result is returned per file, in upload order; a bad file only fails
+    its own entry.
+    """
+    if len(files) > settings.MAX_BULK_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_BULK_FILES} files per request")
+    
+    async def parse_one(file: UploadFile) -> ParseResponse:
+        try:
+            parsed_resume = await _parse_upload(file, use_llm_fallback, llm_provider, race, text_extractor)
+            return ParseResponse(success=True, data=parsed_resume)
+        except HTTPException as e:
+            return ParseResponse(success=False, error=str(e.detail))
+        except Exception as e:
+            return ParseResponse(success=False, error=f"Processing failed: {str(e)}")
+    
+    return await asyncio.gather(*[parse_one(file) for file in files])
+
 @router.post("/parse/async", response_model=ParseResponse)
 async def parse_resume_async(
     background_tasks: BackgroundTasks,
@@ -262,28 +447,34 @@ async def parse_resume_async(
         if not file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
         
-        file_extension = file.filename.split('.')[-1].lower()
-        if file_extension not in settings.SUPPORTED_FORMATS:
+        file_extension = _file_extension(file.filename)
+        if file_extension not in _SUPPORTED_FORMATS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported file format. Supported: {settings.SUPPORTED_FORMATS}"
             )
         
-        file_content = await file.read()
-        if len(file_content) > settings.MAX_FILE_SIZE:
+        if file.size is not None and file.size > settings.MAX_FILE_SIZE:
             raise HTTPException(status_code=413, detail="File too large")
         
+        spooled_file, _ = await spool_and_hash(file, settings.MAX_FILE_SIZE)
+        
         job_id = str(uuid.uuid4())
 
-        # Add background task (you need to implement `process_resume_async` somewhere)
-        background_tasks.add_task(
-            process_resume_async,
-            job_id,
-            file_content,
-            file.filename,
-            use_llm_fallback,
-            llm_provider
-        )
+        # Add background task (you need to implement `process_resume_async` somewhere).
+        # Once queued the task would own the spooled file; until then it's closed here on failure
+        try:
+            background_tasks.add_task(
+                process_resume_async,
+                job_id,
+                spooled_file,
+                file.filename,
+                use_llm_fallback,
+                llm_provider
+            )
+        except BaseException:
+            spooled_file.close()
+            raise
         
         return ParseResponse(
             success=True,
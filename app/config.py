@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -16,11 +17,33 @@ class Settings(BaseSettings):
     
     # Processing Settings
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_MULTIPART_OVERHEAD: int = 64 * 1024  # Form fields and boundaries around the file
     SUPPORTED_FORMATS: list = ["pdf", "docx", "doc", "txt", "png", "jpg", "jpeg"]
+    MAX_BULK_FILES: int = 20
+    
+    # PaddleOCR: oneDNN on CPU, optional INT8-quantized model dirs with precision="int8"
+    OCR_ENABLE_MKLDNN: bool = True
+    OCR_CPU_THREADS: int = max(1, (os.cpu_count() or 2) // 2)
+    OCR_DET_MODEL_DIR: Optional[str] = None
+    OCR_REC_MODEL_DIR: Optional[str] = None
+    OCR_PRECISION: str = "fp32"
+    
+    # spaCy batch size for rule-based parse_many
+    RESUME_SPACY_BATCH_SIZE: int = 32
     
     # Rule-based Parser Confidence Threshold
     RULE_CONFIDENCE_THRESHOLD: float = 0.85
     
+    # LLM fallback tiers: skip above SKIP, full re-parse below FULL, weak sections in between
+    LLM_SKIP_THRESHOLD: float = 0.95
+    LLM_FULL_THRESHOLD: float = 0.60
+    
+    # LLM Request Scheduling
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_BATCH_WINDOW_MS: int = 20
+    LLM_MAX_BATCH_SIZE: int = 32
+    LLM_MAX_RETRIES: int = 3
+    
     # Queue Settings
     QUEUE_NAME: str = "resume_parsing"
     
@@ -1,9 +1,12 @@
-from fastapi import FastAPI
+import logging
+import logging.handlers
+import queue
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
 
-from .api.routes import router
+from .api.routes import router, llm_parser
 from .config import settings
 
 app = FastAPI(
@@ -14,6 +17,40 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Log records are queued from request handlers and written by a background thread
+log_queue = queue.SimpleQueue()
+logger = logging.getLogger("resume_parser")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.propagate = False
+
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
+@app.on_event("startup")
+async def start_log_listener():
+    log_listener.start()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    log_listener.stop()
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    await llm_parser.aclose()
+
+# Reject oversized uploads from the headers, before the multipart body is read.
+# Registered before CORS so CORS wraps it and the 413 still carries CORS headers
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    content_length = request.headers.get("content-length", "")
+    max_files = settings.MAX_BULK_FILES if request.url.path.endswith("/parse/bulk") else 1
+    max_request_size = max_files * settings.MAX_FILE_SIZE + settings.MAX_MULTIPART_OVERHEAD
+    if content_length.isdigit() and int(content_length) > max_request_size:
+        return JSONResponse(status_code=413, content={"detail": "File too large"})
+    return await call_next(request)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, PrivateAttr, field_serializer
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 class ResumeSection(str, Enum):
@@ -72,6 +72,9 @@ class ParsedResume(BaseModel):
     confidence_score: float = 0.0
     parsing_method: str = "unknown"  # "rule_based" or "llm"
     processing_time: float = 0.0
+    
+    # Validated LLM output this resume was built from, reused verbatim when caching
+    _raw_json: Optional[str] = PrivateAttr(default=None)
 
 class ParseResponse(BaseModel):
     success: bool
@@ -84,5 +87,12 @@ class JobStatus(BaseModel):
     status: str  # "pending", "processing", "completed", "failed"
     result: Optional[ParsedResume] = None
     error: Optional[str] = None
-    created_at: datetime
-    completed_at: Optional[datetime] = None
\ No newline at end of file
+    # Unix timestamps in nanoseconds, rendered as ISO 8601 only when serialized
+    created_at: int
+    completed_at: Optional[int] = None
+    
+    @field_serializer("created_at", "completed_at")
+    def _serialize_timestamp(self, value: Optional[int]) -> Optional[str]:
+        if value is None:
+            return None
+        return datetime.fromtimestamp(value / 1e9, tz=timezone.utc).isoformat()
\ No newline at end of file
@@ -0,0 +1,78 @@
+import hashlib
+import logging
+import orjson
+import redis.asyncio as redis
+from typing import Optional, Union
+from ..models.resume_models import ParsedResume
+from ..config import settings
+
+logger = logging.getLogger("resume_parser")
+
+class CacheService:
+    def __init__(self):
+        self.redis = redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def parse_options(use_llm_fallback: bool, llm_provider: str, race: bool) -> str:
+        """Tag for the parse options that change the result, so results under different options don't mix"""
+        if not use_llm_fallback:
+            return "rule"
+        return "race" if race else llm_provider
+
+    @staticmethod
+    def raw_key(file_hash: str, options: str) -> str:
+        """Cache key for the uploaded file, from its BLAKE2b hex digest and the parse options"""
+        return f"raw:{options}:{file_hash}"
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """BLAKE2b hex digest of the extracted text, normalized for whitespace"""
+        normalized = " ".join(text.split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def text_key(text_hash: str, options: str) -> str:
+        """Cache key for the final parse result of a text under the given parse options"""
+        return f"txt:{options}:{text_hash}"
+
+    @staticmethod
+    def rule_key(text_hash: str) -> str:
+        """Cache key for the rule-based result of a text, reused across LLM retries"""
+        return "rule:" + text_hash
+
+    @staticmethod
+    def serialize(parsed_resume: ParsedResume) -> bytes:
+        """Serialize a result for caching, reusing the raw LLM JSON when there is one"""
+        raw_json = parsed_resume._raw_json
+        if raw_json is None:
+            return parsed_resume.model_dump_json().encode()
+        
+        # Splice the parse metadata after the LLM's fields (last key wins) instead of re-dumping the model
+        metadata = orjson.dumps({
+            "confidence_score": parsed_resume.confidence_score,
+            "parsing_method": parsed_resume.parsing_method
+        })
+        body = raw_json.strip()[:-1]
+        if body.rstrip().endswith("{"):
+            return metadata
+        return body.encode() + b"," + metadata[1:]
+
+    async def get_cached_result(self, key: str) -> Optional[bytes]:
+        """Return the cached parse result JSON for a key, if any"""
+        try:
+            cached = await self.redis.get(key)
+        except Exception as e:
+            # Cache is best-effort, a Redis outage must not fail the parse
+            logger.warning("Cache read failed: %s", e)
+            return None
+        return cached
+
+    async def cache_result(self, keys: list, result: Union[str, bytes]):
+        """Store a serialized parse result under every given key"""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.setex(key, settings.CACHE_TTL, result)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Cache write failed: %s", e)
@@ -1,58 +1,414 @@
-import json
 import asyncio
-from typing import Dict, Any, Optional, Tuple
+import logging
+import random
+import re
+import orjson
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+import importlib.util
+import anthropic
 import openai
 from anthropic import AsyncAnthropic
 from ..models.resume_models import ParsedResume
 from ..config import settings
 
+logger = logging.getLogger("resume_parser")
+
+RATE_LIMIT_ERRORS = (openai.RateLimitError, anthropic.RateLimitError)
+CONNECTION_ERRORS = (openai.APIConnectionError, anthropic.APIConnectionError)
+
+# Bump when the system prompt changes so cached prefixes are not mixed across versions
+PROMPT_CACHE_KEY = "resume_parser_v2"
+
+PROMPT_RULES = """You are an expert resume parser. Extract information from resumes and return it in the specified JSON format.
+
+Rules:
+1. Extract only information that is explicitly present in the resume
+2. Use null for missing information, don't make assumptions
+3. For dates, preserve the original format when possible
+4. For experience, separate each job into individual entries
+5. Group skills by category when possible
+6. Extract achievements and accomplishments from job descriptions
+7. Return valid JSON only, no additional text
+8. The resume text is provided in the user message between <resume> tags
+
+Return a JSON object matching this JSON Schema:"""
+
+# Output sections of ParsedResume the LLM fills in; the rest is parse metadata
+RESUME_SECTIONS = ("personal_info", "summary", "experience", "education", "skills", "certifications", "projects", "languages")
+
+_RESUME_SCHEMA = ParsedResume.model_json_schema()
+_DEF_REF_RE = re.compile(r'"#/\$defs/(\w+)"')
+
+def _section_schema(sections: Tuple[str, ...]) -> Dict[str, Any]:
+    """JSON schema for the given ParsedResume sections, with only the $defs they reference"""
+    properties = {section: _RESUME_SCHEMA["properties"][section] for section in sections}
+    refs = set(_DEF_REF_RE.findall(orjson.dumps(properties).decode()))
+    schema = {"type": "object", "properties": properties}
+    if refs:
+        schema["$defs"] = {name: definition for name, definition in _RESUME_SCHEMA["$defs"].items() if name in refs}
+    return schema
+
+def _build_system_prompt(schema: Dict[str, Any]) -> str:
+    """Fixed parsing rules followed by the minified output schema"""
+    return f"{PROMPT_RULES}\n{orjson.dumps(schema).decode()}"
+
+# Built once so the system prompt is a byte-identical, cacheable prefix on every call
+_SYSTEM_PROMPTS = {None: _build_system_prompt(_section_schema(RESUME_SECTIONS))}
+_SYSTEM_PROMPTS.update({section: _build_system_prompt(_section_schema((section,))) for section in RESUME_SECTIONS})
+_SYSTEM_PROMPT = _SYSTEM_PROMPTS[None]
+
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "objective", "career objective", "profile", "about me", "overview"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history", "work history"],
+    "education": ["education", "academic background", "qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "expertise", "technologies"],
+    "certifications": ["certifications", "certificates", "licenses", "credentials"],
+    "projects": ["projects", "personal projects", "academic projects"],
+    "languages": ["languages", "language skills"],
+}
+
+_HEADER_TO_SECTION = {
+    header: section for section, headers in SECTION_HEADERS.items() for header in headers
+}
+
+# A header is a line holding only a known section title, optionally followed by a colon
+_SECTION_RE = re.compile(
+    r"^[ \t]*(" + "|".join(
+        re.escape(h).replace(r"\ ", r"\s+") for h in sorted(_HEADER_TO_SECTION, key=len, reverse=True)
+    ) + r")[ \t]*:?[ \t]*$",
+    re.MULTILINE | re.IGNORECASE
+)
+
+def split_text_into_sections(text: str) -> Dict[str, str]:
+    """Split resume text by section headers; everything before the first header is personal_info"""
+    matches = list(_SECTION_RE.finditer(text))
+    sections = {"personal_info": text[:matches[0].start()] if matches else text}
+    
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        section = _HEADER_TO_SECTION[" ".join(match.group(1).lower().split())]
+        body = text[match.end():next_match.start() if next_match else len(text)]
+        sections[section] = sections.get(section, "") + body
+    
+    return sections
+
+_JSON_OBJECT_OPEN_RE = re.compile(r'\{\s*["}]')
+_JSON_OBJECT_PENDING_RE = re.compile(r'\{\s*\Z')
+
+# Output budget: roughly one token per four characters of input, plus room for the JSON keys
+MIN_OUTPUT_TOKENS = 512
+MAX_OUTPUT_TOKENS = 4000
+
+def classify_llm_error(exc: BaseException) -> str:
+    """Classify an LLM failure as 'rate_limit', 'connection' or 'other' by walking its cause chain"""
+    while exc is not None:
+        if isinstance(exc, RATE_LIMIT_ERRORS):
+            return "rate_limit"
+        if isinstance(exc, CONNECTION_ERRORS):
+            return "connection"
+        exc = exc.__cause__ or exc.__context__
+    return "other"
+
+class _JSONObjectScanner:
+    """Incremental scanner for the first balanced {...} object, skipping braces inside JSON strings"""
+    
+    def __init__(self):
+        # Pieces of the object seen so far, joined once when it closes
+        self._parts: List[str] = []
+        # A '{' at the end of a chunk that can't be classified until more text arrives
+        self._pending = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Scan one more chunk; return the object once it is complete"""
+        if self._pending:
+            chunk = self._pending + chunk
+            self._pending = ""
+        
+        start = 0
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._depth:
+                    self._in_string = True
+            elif ch == '{':
+                if self._depth == 0:
+                    # A JSON object opens with a key or closes immediately, prose braces don't
+                    if not _JSON_OBJECT_OPEN_RE.match(chunk, i):
+                        if _JSON_OBJECT_PENDING_RE.match(chunk, i):
+                            # Can't tell yet, wait for the next chunk
+                            self._pending = chunk[i:]
+                            return None
+                        continue
+                    start = i
+                self._depth += 1
+            elif ch == '}' and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[start:i + 1])
+                    return ''.join(self._parts)
+        
+        if self._depth:
+            self._parts.append(chunk[start:])
+        return None
+
+RESUME_TOOL_NAME = "emit_resume"
+
+# Completeness weights for LLM confidence
+CONTACT_CONFIDENCE_WEIGHTS = {"full_name": 0.2, "email": 0.15, "phone": 0.1}
+SECTION_CONFIDENCE_WEIGHTS = {"experience": 0.25, "education": 0.15, "skills": 0.1, "summary": 0.05}
+
+def _build_resume_tool(section: Optional[str] = None) -> Dict[str, Any]:
+    """Anthropic tool whose input schema is ParsedResume, or just one of its sections"""
+    return {
+        "name": RESUME_TOOL_NAME,
+        "description": "Record the structured data extracted from the resume",
+        "input_schema": _section_schema((section,) if section else RESUME_SECTIONS)
+    }
+
+class BatchedLLMScheduler:
+    """Coalesces parse requests arriving within a short window into concurrent batches"""
+    
+    def __init__(self, handler: Callable[..., Awaitable[Any]], window: float, max_batch_size: int):
+        self._handler = handler
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batches = set()
+    
+    async def submit(self, *args) -> Any:
+        """Queue a call to the handler and wait for its result"""
+        # Started lazily on the running loop, and restarted if that loop changed (reloads, test lifespans)
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            self._loop = loop
+        
+        future = loop.create_future()
+        await self._queue.put((args, future))
+        return await future
+    
+    async def aclose(self):
+        """Stop the batching worker if it runs on the current loop"""
+        worker = self._worker
+        self._worker = None
+        if worker is not None and not worker.done() and self._loop is asyncio.get_running_loop():
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._window
+            
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Don't hold up the next window while this batch is in flight
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _run_batch(self, batch: list):
+        await asyncio.gather(*[self._dispatch(*item) for item in batch])
+    
+    async def _dispatch(self, args: tuple, future: asyncio.Future):
+        try:
+            result = await self._handler(*args)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def _build_http_client(sdk) -> Any:
+    """Long-lived pooled client for one SDK, built from that SDK's own HTTP client class"""
+    # Each SDK only accepts its own client type; its default pool (1000 connections) covers batched traffic.
+    # Retries are handled by _call_with_backoff, not the transport
+    return sdk.DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE, timeout=sdk.Timeout(60.0, connect=5.0))
+
 class LLMParser:
     def __init__(self):
+        self.http_clients = []
+        
         if settings.OPENAI_API_KEY:
-            self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            http_client = _build_http_client(openai)
+            self.http_clients.append(http_client)
+            self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
         else:
             self.openai_client = None
             
         if settings.ANTHROPIC_API_KEY:
-            self.anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+            http_client = _build_http_client(anthropic)
+            self.http_clients.append(http_client)
+            self.anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, http_client=http_client)
         else:
             self.anthropic_client = None
+        
+        self._sem = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        
+        # Forcing this tool makes Anthropic return the resume as structured input, not free text
+        self._resume_tools = {None: _build_resume_tool()}
+        self._resume_tools.update({section: _build_resume_tool(section) for section in RESUME_SECTIONS})
+        self.scheduler = BatchedLLMScheduler(
+            self._parse_with_provider,
+            window=settings.LLM_BATCH_WINDOW_MS / 1000,
+            max_batch_size=settings.LLM_MAX_BATCH_SIZE
+        )
+    
+    async def aclose(self):
+        """Stop the scheduler and close the SDKs' HTTP clients and their pooled connections"""
+        await self.scheduler.aclose()
+        for http_client in self.http_clients:
+            await http_client.aclose()
     
-    async def parse(self, text: str, provider: str = "openai") -> Tuple[ParsedResume, float]:
-        """Parse resume using LLM"""
+    async def parse(self, text: str, provider: str = "openai", race: bool = False) -> Tuple[ParsedResume, float]:
+        """Parse resume using LLM, optionally racing every configured provider"""
+        if race:
+            return await self._parse_racing(text)
+        return await self.scheduler.submit(text, provider)
+    
+    async def parse_sections(
+        self, text: str, base: ParsedResume, sections: List[str], provider: str = "openai", race: bool = False
+    ) -> Tuple[ParsedResume, float]:
+        """Re-parse only the given sections with the LLM and merge them into base"""
+        chunks = split_text_into_sections(text)
+        targets = [section for section in sections if chunks.get(section, "").strip()]
+        if not targets:
+            return base, base.confidence_score
+        
+        results = await asyncio.gather(
+            *[
+                self._parse_racing(chunks[section], section) if race
+                else self.scheduler.submit(chunks[section], provider, section)
+                for section in targets
+            ],
+            return_exceptions=True
+        )
+        
+        # If every section failed the caller must see a failure, or the rule-only result gets cached
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) == len(targets):
+            raise Exception(f"LLM section parsing failed for {', '.join(targets)}") from errors[-1]
+        
+        update = {}
+        for section, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning("LLM section parse failed for %s (%s): %s", section, classify_llm_error(result), result)
+                continue
+            value = getattr(result[0], section)
+            if section == "personal_info":
+                # Field by field, so an empty LLM field never erases a rule-found one
+                found = {field: field_value for field, field_value in value if field_value}
+                if found:
+                    update[section] = base.personal_info.model_copy(update=found)
+            elif value:
+                update[section] = value
+        
+        # Nothing from the LLM made it in, so the rule result and its own score stand
+        if not update:
+            return base, base.confidence_score
+        
+        merged = base.model_copy(update=update)
+        merged._raw_json = None
+        merged.parsing_method = "hybrid"
+        confidence = self._calculate_llm_confidence(merged)
+        merged.confidence_score = confidence
+        
+        return merged, confidence
+    
+    async def _parse_racing(self, text: str, section: Optional[str] = None) -> Tuple[ParsedResume, float]:
+        """Run every configured provider concurrently and return the first successful parse"""
+        providers = [
+            name for name, client in (("openai", self.openai_client), ("anthropic", self.anthropic_client))
+            if client
+        ]
+        if not providers:
+            raise Exception("LLM parsing failed: no provider configured")
+        
+        # Bypasses the batch scheduler so the losing request can actually be cancelled
+        pending = {
+            asyncio.create_task(self._parse_with_provider(text, provider, section))
+            for provider in providers
+        }
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise error
+    
+    async def _parse_with_provider(
+        self, text: str, provider: str, section: Optional[str] = None
+    ) -> Tuple[ParsedResume, float]:
+        """Dispatch a single parse to the requested provider"""
         try:
             if provider == "openai" and self.openai_client:
-                return await self._parse_with_openai(text)
+                return await self._parse_with_openai(text, section)
             elif provider == "anthropic" and self.anthropic_client:
-                return await self._parse_with_anthropic(text)
+                return await self._parse_with_anthropic(text, section)
             else:
                 raise ValueError(f"Provider {provider} not available or not configured")
                 
         except Exception as e:
             raise Exception(f"LLM parsing failed: {str(e)}")
     
-    async def _parse_with_openai(self, text: str) -> Tuple[ParsedResume, float]:
+    async def _call_with_backoff(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Run an LLM request under the concurrency limit, backing off on rate limits"""
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            try:
+                async with self._sem:
+                    return await request()
+            except RATE_LIMIT_ERRORS:
+                if attempt == settings.LLM_MAX_RETRIES:
+                    raise
+                await asyncio.sleep(2 ** attempt + random.random())
+    
+    async def _parse_with_openai(self, text: str, section: Optional[str] = None) -> Tuple[ParsedResume, float]:
         """Parse using OpenAI GPT-4o-mini"""
         prompt = self._create_parsing_prompt(text)
         
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=4000,
-                response_format={"type": "json_object"}
+            content = await self._call_with_backoff(
+                lambda: self._stream_openai_json(prompt, section, self._max_tokens_for(text))
             )
             
-            result = json.loads(response.choices[0].message.content)
-            parsed_resume = self._convert_to_pydantic(result)
+            result = orjson.loads(content)
+            parsed_resume, confidence = self._convert_to_pydantic_and_score(
+                result, raw_json=content if section is None else None, section=section
+            )
             parsed_resume.parsing_method = "llm_openai"
-            
-            # Calculate confidence based on completeness
-            confidence = self._calculate_llm_confidence(parsed_resume)
             parsed_resume.confidence_score = confidence
             
             return parsed_resume, confidence
@@ -60,30 +416,65 @@ class LLMParser:
         except Exception as e:
             raise Exception(f"OpenAI parsing error: {str(e)}")
     
-    async def _parse_with_anthropic(self, text: str) -> Tuple[ParsedResume, float]:
+    async def _stream_openai_json(self, prompt: str, section: Optional[str], max_tokens: int) -> str:
+        """Stream a JSON-mode completion, stopping as soon as the object is complete"""
+        stream = await self.openai_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": self._get_system_prompt(section)},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": f"{PROMPT_CACHE_KEY}:{section or 'full'}"},
+            stream=True
+        )
+        
+        scanner = _JSONObjectScanner()
+        try:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                content = scanner.feed(chunk.choices[0].delta.content)
+                if content is not None:
+                    return content
+        finally:
+            # Drops the connection early if the model keeps emitting after the object closed
+            await stream.close()
+        
+        raise ValueError("Response ended before the JSON object was complete")
+    
+    def _max_tokens_for(self, text: str) -> int:
+        """Size the output budget from the input length instead of a flat maximum"""
+        approx_input_tokens = len(text) // 4
+        return max(MIN_OUTPUT_TOKENS, min(MAX_OUTPUT_TOKENS, approx_input_tokens + MIN_OUTPUT_TOKENS))
+    
+    async def _parse_with_anthropic(self, text: str, section: Optional[str] = None) -> Tuple[ParsedResume, float]:
         """Parse using Anthropic Claude"""
         prompt = self._create_parsing_prompt(text)
         
         try:
-            response = await self.anthropic_client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=4000,
-                temperature=0.1,
-                system=self._get_system_prompt(),
-                messages=[{"role": "user", "content": prompt}]
+            response = await self._call_with_backoff(
+                lambda: self.anthropic_client.messages.create(
+                    model="claude-3-haiku-20240307",
+                    max_tokens=self._max_tokens_for(text),
+                    temperature=0.1,
+                    system=[{
+                        "type": "text",
+                        "text": self._get_system_prompt(section),
+                        "cache_control": {"type": "ephemeral"}
+                    }],
+                    messages=[{"role": "user", "content": prompt}],
+                    tools=[self._resume_tools[section]],
+                    tool_choice={"type": "tool", "name": RESUME_TOOL_NAME}
+                )
             )
             
-            # Extract JSON from response
-            content = response.content[0].text
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            json_content = content[json_start:json_end]
-            
-            result = json.loads(json_content)
-            parsed_resume = self._convert_to_pydantic(result)
+            # The forced tool call carries the already-decoded JSON
+            result = next(block.input for block in response.content if block.type == "tool_use")
+            parsed_resume, confidence = self._convert_to_pydantic_and_score(result, section=section)
             parsed_resume.parsing_method = "llm_anthropic"
-            
-            confidence = self._calculate_llm_confidence(parsed_resume)
             parsed_resume.confidence_score = confidence
             
             return parsed_resume, confidence
@@ -91,120 +482,41 @@ class LLMParser:
         except Exception as e:
             raise Exception(f"Anthropic parsing error: {str(e)}")
     
-    def _get_system_prompt(self) -> str:
-        """Get system prompt for LLM"""
-        return """You are an expert resume parser. Extract information from resumes and return it in the specified JSON format.
-
-Rules:
-1. Extract only information that is explicitly present in the resume
-2. Use null for missing information, don't make assumptions
-3. For dates, preserve the original format when possible
-4. For experience, separate each job into individual entries
-5. Group skills by category when possible
-6. Extract achievements and accomplishments from job descriptions
-7. Return valid JSON only, no additional text
-
-Return the data in this exact JSON structure:
-{
-  "personal_info": {
-    "full_name": "string or null",
-    "email": "string or null",
-    "phone": "string or null",
-    "address": "string or null",
-    "linkedin": "string or null",
-    "github": "string or null",
-    "portfolio": "string or null"
-  },
-  "summary": "string or null",
-  "experience": [
-    {
-      "company": "string or null",
-      "position": "string or null",
-      "start_date": "string or null",
-      "end_date": "string or null",
-      "is_current": "boolean",
-      "description": "string or null",
-      "achievements": ["array of strings"]
-    }
-  ],
-  "education": [
-    {
-      "institution": "string or null",
-      "degree": "string or null",
-      "field_of_study": "string or null",
-      "graduation_date": "string or null",
-      "gpa": "string or null"
-    }
-  ],
-  "skills": [
-    {
-      "category": "string or null",
-      "skills": ["array of strings"]
-    }
-  ],
-  "certifications": [
-    {
-      "name": "string or null",
-      "issuer": "string or null",
-      "date": "string or null",
-      "credential_id": "string or null"
-    }
-  ],
-  "projects": [
-    {
-      "name": "string or null",
-      "description": "string or null",
-      "technologies": ["array of strings"],
-      "url": "string or null",
-      "start_date": "string or null",
-      "end_date": "string or null"
-    }
-  ],
-  "languages": [
-    {
-      "language": "string or null",
-      "proficiency": "string or null"
-    }
-  ]
-}"""
+    def _get_system_prompt(self, section: Optional[str] = None) -> str:
+        """Get system prompt for LLM, optionally restricted to a single section's schema"""
+        if section is None:
+            return _SYSTEM_PROMPT
+        return _SYSTEM_PROMPTS[section]
     
     def _create_parsing_prompt(self, text: str) -> str:
         """Create parsing prompt with resume text"""
-        return f"""Please parse the following resume text and extract all relevant information according to the JSON schema provided in the system prompt.
-
-Resume Text:
-{text}
-
-Return only the JSON object, no additional text or explanation."""
+        # All fixed instructions live in the system prompt so it forms a stable, cacheable prefix
+        return f"<resume>\n{text}\n</resume>"
     
-    def _convert_to_pydantic(self, data: Dict[str, Any]) -> ParsedResume:
-        """Convert parsed JSON to Pydantic model"""
+    def _convert_to_pydantic_and_score(
+        self, data: Dict[str, Any], raw_json: Optional[str] = None, section: Optional[str] = None
+    ) -> Tuple[ParsedResume, float]:
+        """Convert parsed JSON to Pydantic model, scoring completeness from the same dict"""
+        personal_info = data.get("personal_info") or {}
+        score = sum(weight for field, weight in CONTACT_CONFIDENCE_WEIGHTS.items() if personal_info.get(field))
+        score += sum(weight for field, weight in SECTION_CONFIDENCE_WEIGHTS.items() if data.get(field))
+        
         try:
-            return ParsedResume.model_validate(data)
+            parsed_resume = ParsedResume.model_validate(data)
         except Exception as e:
+            # A section result is merged over rule-found data, so an empty stand-in would erase it
+            if section is not None:
+                raise
             # Create a basic structure if validation fails
-            return ParsedResume()
+            return ParsedResume(), 0.0
+        
+        parsed_resume._raw_json = raw_json
+        return parsed_resume, min(score, 1.0)
     
     def _calculate_llm_confidence(self, parsed_resume: ParsedResume) -> float:
-        """Calculate confidence score for LLM parsed resume"""
-        score = 0.0
-        
-        # Personal info
-        if parsed_resume.personal_info.full_name:
-            score += 0.2
-        if parsed_resume.personal_info.email:
-            score += 0.15
-        if parsed_resume.personal_info.phone:
-            score += 0.1
-        
-        # Main sections
-        if parsed_resume.experience:
-            score += 0.25
-        if parsed_resume.education:
-            score += 0.15
-        if parsed_resume.skills:
-            score += 0.1
-        
-        # Additional content
-        if parsed_resume.summary:
-            score += 0.05
\ No newline at end of file
+        """Calculate confidence score for an already-built resume (e.g. merged sections)"""
+        personal_info = parsed_resume.personal_info
+        score = sum(weight for field, weight in CONTACT_CONFIDENCE_WEIGHTS.items() if getattr(personal_info, field))
+        score += sum(weight for field, weight in SECTION_CONFIDENCE_WEIGHTS.items() if getattr(parsed_resume, field))
+        
+        return min(score, 1.0)
\ No newline at end of file
@@ -1,26 +1,100 @@
 import re
-import spacy
-from typing import Dict, List, Optional, Tuple
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+try:
+    # Linear-time RE2 engine for the contact patterns, when installed
+    import re2 as fast_re
+except ImportError:
+    fast_re = re
+from typing import Dict, List, Mapping, Optional, Pattern, Tuple
+from ..config import settings
 from ..models.resume_models import (
     ParsedResume, PersonalInfo, Experience, Education, 
     Skill, Certification, Project, Language
 )
 
+# The name is looked for in this many leading header lines
+NAME_SEARCH_LINES = 5
+
+# Section name -> its stripped, non-empty lines
+Sections = Mapping[str, Tuple[str, ...]]
+
+@lru_cache(maxsize=512)
+def _split_into_sections_cached(
+    text: str, section_re: Pattern, kw_sections: Tuple[str, ...]
+) -> Mapping[str, Tuple[str, ...]]:
+    """Split resume text into sections of stripped, non-empty lines, memoized for re-parses"""
+    sections = {}
+    lines = text.splitlines()
+    current_section = 'header'
+    current_content = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        # Check if line is a section header
+        section_found = None
+        if len(line) < 50:
+            match = section_re.search(line)
+            if match:
+                section_found = kw_sections[match.lastindex - 1]
+        
+        if section_found:
+            # Save previous section
+            if current_content:
+                sections[current_section] = tuple(current_content)
+            
+            # Start new section
+            current_section = section_found
+            current_content = []
+        else:
+            current_content.append(line)
+    
+    # Save last section
+    if current_content:
+        sections[current_section] = tuple(current_content)
+    
+    # Read-only, the cached value is shared between callers
+    return MappingProxyType(sections)
+
 class RuleBasedParser:
     def __init__(self):
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            # Fallback if model not installed
-            self.nlp = None
-        
-        # Regex patterns
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
-        self.linkedin_pattern = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
-        self.github_pattern = re.compile(r'github\.com/[\w-]+', re.IGNORECASE)
-        self.url_pattern = re.compile(r'https?://[^\s]+')
+        # spaCy is loaded on first use
+        self._nlp = None
+        self._nlp_loaded = False
+        self._nlp_lock = threading.Lock()
+        
+        # Regex patterns (no lookarounds or backreferences, so they also run on RE2)
+        email_re = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        phone_re = r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+        linkedin_re = r'linkedin\.com/in/[\w-]+'
+        github_re = r'github\.com/[\w-]+'
+        self.url_pattern = fast_re.compile(r'https?://[^\s]+')
+        # Any contact detail at all, in one search, for skipping contact lines
+        self._contact_any_re = fast_re.compile(
+            r'(?i)(?:' + '|'.join((email_re, phone_re, linkedin_re, github_re)) + r')'
+        )
+        # Every contact kind in one pass over the header; earlier alternatives win overlapping spans.
+        # Digit lookarounds keep phone numbers from being cut out of longer digit runs (stdlib re only)
+        self._contact_scan_re = re.compile(
+            rf'(?P<email>{email_re})|(?P<linkedin>{linkedin_re})|(?P<github>{github_re})'
+            rf'|(?P<phone>(?<!\d){phone_re}(?!\d))',
+            re.IGNORECASE
+        )
+        
+        # Extractor patterns
+        self._exp_entry_start_re = re.compile(r'[A-Z][^a-z]*[A-Z]')
+        self._date_any_re = re.compile(r'\d{4}|\d{1,2}/\d{4}|\w+\s+\d{4}')
+        self._year_re = re.compile(r'\d{4}')
+        self._date_cert_re = re.compile(r'\d{4}|\d{1,2}/\d{4}')
+        self._skills_sep_table = str.maketrans({',': '\n', ';': '\n', '•': '\n'})
+        self._tech_re = re.compile(r'Technologies?:?\s*([^\n]+)', re.IGNORECASE)
+        self._paren_re = re.compile(r'[()]')
+        self._institution_keywords = ('university', 'college', 'institute', 'school')
+        self._degree_keywords = ('bachelor', 'master', 'phd', 'degree', 'bs', 'ms', 'ba', 'ma')
         
         # Section keywords
         self.section_keywords = {
@@ -32,13 +106,64 @@ class RuleBasedParser:
             'summary': ['summary', 'objective', 'profile', 'about me', 'overview'],
             'languages': ['languages', 'language skills', 'linguistic skills']
         }
+        
+        # Flat, parallel keyword/section tuples, longest keywords first so specific headers win
+        pairs = sorted(
+            ((keyword.lower(), section) for section, keywords in self.section_keywords.items() for keyword in keywords),
+            key=lambda pair: -len(pair[0])
+        )
+        self._kw_strs, self._kw_sections = (tuple(column) for column in zip(*pairs))
+        # One group per keyword, so match.lastindex indexes straight into _kw_sections
+        self._section_re = re.compile(
+            r'\b(?:' + '|'.join('(' + re.escape(k) + ')' for k in self._kw_strs) + r')\b',
+            re.IGNORECASE
+        )
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline with only NER enabled, or None if the model isn't installed"""
+        if not self._nlp_loaded:
+            with self._nlp_lock:
+                if not self._nlp_loaded:
+                    import spacy
+                    try:
+                        # en_core_web_sm's NER has its own embedding layer, nothing else is needed
+                        self._nlp = spacy.load(
+                            "en_core_web_sm",
+                            exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+                        )
+                    except OSError:
+                        # Fallback if model not installed
+                        self._nlp = None
+                    self._nlp_loaded = True
+        return self._nlp
     
     def parse(self, text: str) -> Tuple[ParsedResume, float]:
         """Parse resume using rule-based approach"""
-        sections = self._split_into_sections(text)
-        
+        return self.parse_many([text])[0]
+    
+    def parse_many(self, texts: List[str]) -> List[Tuple[ParsedResume, float]]:
+        """Parse several resumes, batching spaCy over the ones whose name the line rule misses"""
+        all_sections = [self._split_into_sections(text) for text in texts]
+        names = [self._name_from_lines(sections.get('header', ())) for sections in all_sections]
+        
+        # NER is only a fallback, and only runs over the resumes that still need a name
+        missing = [i for i, name in enumerate(names) if name is None]
+        nlp = self.nlp if missing else None
+        if nlp is not None:
+            ner_texts = [self._ner_text(texts[i], all_sections[i]) for i in missing]
+            for i, doc in zip(missing, nlp.pipe(ner_texts, batch_size=settings.RESUME_SPACY_BATCH_SIZE)):
+                names[i] = next((ent.text.strip() for ent in doc.ents if ent.label_ == 'PERSON'), None)
+        
+        return [
+            self._parse_sections(text, sections, name)
+            for text, sections, name in zip(texts, all_sections, names)
+        ]
+    
+    def _parse_sections(self, text: str, sections: Sections, name: Optional[str]) -> Tuple[ParsedResume, float]:
+        """Build the parse result of one resume from its sections"""
         parsed_resume = ParsedResume(
-            personal_info=self._extract_personal_info(text, sections),
+            personal_info=self._extract_personal_info(self._header_text(text, sections), name),
             summary=self._extract_summary(sections),
             experience=self._extract_experience(sections),
             education=self._extract_education(sections),
@@ -54,78 +179,40 @@ class RuleBasedParser:
         
         return parsed_resume, confidence
     
-    def _split_into_sections(self, text: str) -> Dict[str, str]:
+    def _split_into_sections(self, text: str) -> Sections:
         """Split resume text into sections"""
-        sections = {}
-        lines = text.split('\n')
-        current_section = 'header'
-        current_content = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Check if line is a section header
-            section_found = None
-            for section, keywords in self.section_keywords.items():
-                for keyword in keywords:
-                    if keyword.lower() in line.lower() and len(line) < 50:
-                        section_found = section
-                        break
-                if section_found:
-                    break
-            
-            if section_found:
-                # Save previous section
-                if current_content:
-                    sections[current_section] = '\n'.join(current_content)
-                
-                # Start new section
-                current_section = section_found
-                current_content = []
-            else:
-                current_content.append(line)
-        
-        # Save last section
-        if current_content:
-            sections[current_section] = '\n'.join(current_content)
-        
-        return sections
+        return _split_into_sections_cached(text, self._section_re, self._kw_sections)
+    
+    def _header_text(self, text: str, sections: Sections) -> str:
+        """Text searched for contact information"""
+        return '\n'.join(sections.get('header', ())) + '\n' + text[:500]  # First 500 chars
+    
+    def _ner_text(self, text: str, sections: Sections) -> str:
+        """Top of the resume handed to spaCy, the header once or else the first 500 chars"""
+        header_lines = sections.get('header')
+        return '\n'.join(header_lines) if header_lines else text[:500]
+    
+    def _name_from_lines(self, header_lines: Tuple[str, ...]) -> Optional[str]:
+        """First header line near the top that's not contact info"""
+        for line in header_lines[:NAME_SEARCH_LINES]:
+            if (len(line) < 100 and not self._contact_any_re.search(line)
+                    and not line.lower().startswith(('resume', 'cv', 'curriculum'))):
+                return line
+        return None
     
-    def _extract_personal_info(self, text: str, sections: Dict[str, str]) -> PersonalInfo:
-        """Extract personal information"""
-        header_text = sections.get('header', '')
-        full_text = header_text + '\n' + text[:500]  # First 500 chars
-        
-        # Extract email
-        email_matches = self.email_pattern.findall(full_text)
-        email = email_matches[0] if email_matches else None
-        
-        # Extract phone
-        phone_matches = self.phone_pattern.findall(full_text)
-        phone = phone_matches[0] if phone_matches else None
-        if isinstance(phone, tuple):
-            phone = ''.join(phone)
-        
-        # Extract LinkedIn
-        linkedin_matches = self.linkedin_pattern.findall(full_text)
-        linkedin = f"https://{linkedin_matches[0]}" if linkedin_matches else None
-        
-        # Extract GitHub
-        github_matches = self.github_pattern.findall(full_text)
-        github = f"https://{github_matches[0]}" if github_matches else None
-        
-        # Extract name (first non-empty line that's not contact info)
-        name = None
-        for line in full_text.split('\n'):
-            line = line.strip()
-            if line and not any(pattern.search(line) for pattern in [
-                self.email_pattern, self.phone_pattern, self.linkedin_pattern, self.github_pattern
-            ]):
-                if len(line) < 100 and not line.lower().startswith(('resume', 'cv', 'curriculum')):
-                    name = line
-                    break
+    def _extract_personal_info(self, full_text: str, name: Optional[str]) -> PersonalInfo:
+        """Extract contact details; the name comes from the header lines or the spaCy fallback"""
+        # Extract email, phone, LinkedIn and GitHub (first of each) in a single scan
+        contacts = {}
+        for match in self._contact_scan_re.finditer(full_text):
+            contacts.setdefault(match.lastgroup, match.group())
+            if len(contacts) == 4:
+                break
+        
+        email = contacts.get('email')
+        phone = contacts.get('phone')
+        linkedin = f"https://{contacts['linkedin']}" if 'linkedin' in contacts else None
+        github = f"https://{contacts['github']}" if 'github' in contacts else None
         
         return PersonalInfo(
             full_name=name,
@@ -135,41 +222,43 @@ class RuleBasedParser:
             github=github
         )
     
-    def _extract_summary(self, sections: Dict[str, str]) -> Optional[str]:
+    def _extract_summary(self, sections: Sections) -> Optional[str]:
         """Extract summary/objective"""
-        summary_text = sections.get('summary', '')
-        if summary_text:
-            return summary_text.strip()
+        summary_lines = sections.get('summary')
+        if summary_lines:
+            return '\n'.join(summary_lines)
         return None
     
-    def _extract_experience(self, sections: Dict[str, str]) -> List[Experience]:
+    def _extract_experience(self, sections: Sections) -> List[Experience]:
         """Extract work experience"""
-        experience_text = sections.get('experience', '')
-        if not experience_text:
+        experience_lines = sections.get('experience')
+        if not experience_lines:
             return []
         
-        experiences = []
-        # Simple parsing - split by job entries (lines starting with company/position)
-        entries = re.split(r'\n(?=[A-Z][^a-z\n]*[A-Z])', experience_text)
+        # Simple parsing - a job entry starts at a line beginning with company/position in caps
+        entries = []
+        for line in experience_lines:
+            if not entries or self._exp_entry_start_re.match(line):
+                entries.append([line])
+            else:
+                entries[-1].append(line)
         
-        for entry in entries:
-            if not entry.strip():
-                continue
-                
-            lines = [line.strip() for line in entry.split('\n') if line.strip()]
+        experiences = []
+        for lines in entries:
             if len(lines) < 2:
                 continue
+            entry = '\n'.join(lines)
             
             # First line usually contains company and/or position
             first_line = lines[0]
             
             # Extract dates
-            date_pattern = r'(\d{4}|\d{1,2}/\d{4}|\w+\s+\d{4})'
-            dates = re.findall(date_pattern, entry)
+            dates = self._date_any_re.findall(entry)
             
             start_date = dates[0] if len(dates) > 0 else None
             end_date = dates[1] if len(dates) > 1 else None
-            is_current = 'present' in entry.lower() or 'current' in entry.lower()
+            entry_l = entry.lower()
+            is_current = 'present' in entry_l or 'current' in entry_l
             
             # Simple heuristic to separate company and position
             company = None
@@ -199,81 +288,72 @@ class RuleBasedParser:
         
         return experiences
     
-    def _extract_education(self, sections: Dict[str, str]) -> List[Education]:
+    def _extract_education(self, sections: Sections) -> List[Education]:
         """Extract education information"""
-        education_text = sections.get('education', '')
-        if not education_text:
+        lines = sections.get('education')
+        if not lines:
             return []
         
-        educations = []
-        entries = education_text.split('\n\n')
+        # Blank lines are dropped when splitting sections, so the section is a single entry
+        # Extract graduation date
+        dates = [year for line in lines for year in self._year_re.findall(line)]
+        graduation_date = dates[-1] if dates else None
         
-        for entry in entries:
-            if not entry.strip():
-                continue
-            
-            lines = [line.strip() for line in entry.split('\n') if line.strip()]
-            
-            # Extract graduation date
-            date_pattern = r'(\d{4})'
-            dates = re.findall(date_pattern, entry)
-            graduation_date = dates[-1] if dates else None
-            
-            # Simple parsing
-            institution = None
-            degree = None
-            field_of_study = None
-            
-            for line in lines:
-                if any(keyword in line.lower() for keyword in ['university', 'college', 'institute', 'school']):
-                    institution = line
-                elif any(keyword in line.lower() for keyword in ['bachelor', 'master', 'phd', 'degree', 'bs', 'ms', 'ba', 'ma']):
-                    if 'in' in line.lower():
-                        parts = line.lower().split('in')
-                        degree = parts[0].strip()
-                        field_of_study = parts[1].strip() if len(parts) > 1 else None
-                    else:
-                        degree = line
-            
-            educations.append(Education(
-                institution=institution,
-                degree=degree,
-                field_of_study=field_of_study,
-                graduation_date=graduation_date
-            ))
+        # Simple parsing
+        institution = None
+        degree = None
+        field_of_study = None
         
-        return educations
+        for line in lines:
+            line_l = line.lower()
+            if any(keyword in line_l for keyword in self._institution_keywords):
+                institution = line
+            elif any(keyword in line_l for keyword in self._degree_keywords):
+                if 'in' in line_l:
+                    parts = line_l.split('in')
+                    degree = parts[0].strip()
+                    field_of_study = parts[1].strip() if len(parts) > 1 else None
+                else:
+                    degree = line
+        
+        return [Education(
+            institution=institution,
+            degree=degree,
+            field_of_study=field_of_study,
+            graduation_date=graduation_date
+        )]
     
-    def _extract_skills(self, sections: Dict[str, str]) -> List[Skill]:
+    def _extract_skills(self, sections: Sections) -> List[Skill]:
         """Extract skills"""
-        skills_text = sections.get('skills', '')
-        if not skills_text:
+        skills_lines = sections.get('skills')
+        if not skills_lines:
             return []
         
-        # Simple extraction - split by common separators
-        skills_raw = re.split(r'[,;•\n]', skills_text)
-        skills_cleaned = [skill.strip() for skill in skills_raw if skill.strip()]
+        # Simple extraction - turn common separators into newlines, then split once in C
+        skills_raw = '\n'.join(skills_lines).translate(self._skills_sep_table).split('\n')
+        skills_cleaned = [skill for skill in map(str.strip, skills_raw) if skill]
         
         # Group skills (simple approach)
         return [Skill(category="Technical Skills", skills=skills_cleaned)]
     
-    def _extract_certifications(self, sections: Dict[str, str]) -> List[Certification]:
+    def _extract_certifications(self, sections: Sections) -> List[Certification]:
         """Extract certifications"""
-        cert_text = sections.get('certifications', '')
-        if not cert_text:
+        cert_lines = sections.get('certifications')
+        if not cert_lines:
             return []
         
         certifications = []
-        lines = [line.strip() for line in cert_text.split('\n') if line.strip()]
-        
-        for line in lines:
-            # Extract date
-            date_pattern = r'(\d{4}|\d{1,2}/\d{4})'
-            dates = re.findall(date_pattern, line)
-            date = dates[0] if dates else None
-            
-            # Remove date from name
-            name = re.sub(r'\d{4}|\d{1,2}/\d{4}', '', line).strip()
+        for line in cert_lines:
+            # One scan: the first date is kept, every date is cut out of the name by joining the gaps
+            date = None
+            pieces = []
+            end = 0
+            for match in self._date_cert_re.finditer(line):
+                if date is None:
+                    date = match.group(0)
+                pieces.append(line[end:match.start()])
+                end = match.end()
+            name = (''.join(pieces) + line[end:]).strip() if pieces else line
             
             certifications.append(Certification(
                 name=name,
@@ -282,48 +362,36 @@ class RuleBasedParser:
         
         return certifications
     
-    def _extract_projects(self, sections: Dict[str, str]) -> List[Project]:
+    def _extract_projects(self, sections: Sections) -> List[Project]:
         """Extract projects"""
-        projects_text = sections.get('projects', '')
-        if not projects_text:
+        lines = sections.get('projects')
+        if not lines:
             return []
         
-        projects = []
-        entries = projects_text.split('\n\n')
-        
-        for entry in entries:
-            if not entry.strip():
-                continue
-            
-            lines = [line.strip() for line in entry.split('\n') if line.strip()]
-            name = lines[0] if lines else None
-            description = '\n'.join(lines[1:]) if len(lines) > 1 else ''
-            
-            # Extract technologies (simple pattern)
-            tech_pattern = r'Technologies?:?\s*([^\n]+)'
-            tech_match = re.search(tech_pattern, description, re.IGNORECASE)
-            technologies = []
-            if tech_match:
-                technologies = [tech.strip() for tech in tech_match.group(1).split(',')]
-            
-            projects.append(Project(
-                name=name,
-                description=description,
-                technologies=technologies
-            ))
-        
-        return projects
+        # Blank lines are dropped when splitting sections, so the section is a single entry
+        name = lines[0]
+        description = '\n'.join(lines[1:]) if len(lines) > 1 else ''
+        
+        # Extract technologies (simple pattern)
+        tech_match = self._tech_re.search(description)
+        technologies = []
+        if tech_match:
+            technologies = [tech.strip() for tech in tech_match.group(1).split(',')]
+        
+        return [Project(
+            name=name,
+            description=description,
+            technologies=technologies
+        )]
     
-    def _extract_languages(self, sections: Dict[str, str]) -> List[Language]:
+    def _extract_languages(self, sections: Sections) -> List[Language]:
         """Extract languages"""
-        lang_text = sections.get('languages', '')
-        if not lang_text:
+        lang_lines = sections.get('languages')
+        if not lang_lines:
             return []
         
         languages = []
-        lines = [line.strip() for line in lang_text.split('\n') if line.strip()]
-        
-        for line in lines:
+        for line in lang_lines:
             # Simple parsing - language and proficiency
             if ':' in line or '(' in line:
                 if ':' in line:
@@ -331,7 +399,7 @@ class RuleBasedParser:
                     language = parts[0].strip()
                     proficiency = parts[1].strip() if len(parts) > 1 else None
                 else:  # parentheses
-                    parts = re.split(r'[()]', line)
+                    parts = self._paren_re.split(line)
                     language = parts[0].strip()
                     proficiency = parts[1].strip() if len(parts) > 1 else None
                 
@@ -344,6 +412,29 @@ class RuleBasedParser:
         
         return languages
     
+    def section_confidences(self, parsed_resume: ParsedResume) -> Dict[str, float]:
+        """Score each section separately so only weak ones are sent to the LLM"""
+        info = parsed_resume.personal_info
+        contact_fields = [info.full_name, info.email, info.phone]
+        
+        return {
+            'personal_info': sum(1 for value in contact_fields if value) / len(contact_fields),
+            'summary': 1.0 if parsed_resume.summary else 0.0,
+            'experience': self._entry_completeness(parsed_resume.experience, ['company', 'position', 'start_date']),
+            'education': self._entry_completeness(parsed_resume.education, ['institution', 'degree', 'graduation_date']),
+            'skills': 1.0 if parsed_resume.skills else 0.0,
+            'certifications': self._entry_completeness(parsed_resume.certifications, ['name']),
+            'projects': self._entry_completeness(parsed_resume.projects, ['name', 'description']),
+            'languages': self._entry_completeness(parsed_resume.languages, ['language'])
+        }
+    
+    def _entry_completeness(self, entries: list, fields: List[str]) -> float:
+        """Fraction of the given fields filled in across all entries"""
+        if not entries:
+            return 0.0
+        filled = sum(1 for entry in entries for field in fields if getattr(entry, field))
+        return filled / (len(entries) * len(fields))
+    
     def _calculate_confidence(self, parsed_resume: ParsedResume, original_text: str) -> float:
         """Calculate confidence score based on extracted information"""
         score = 0.0
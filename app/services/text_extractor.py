@@ -1,41 +1,148 @@
 import fitz  # PyMuPDF
-import docx
 import mammoth
 import magic
 import io
+import numpy as np
 from PIL import Image
-import paddleocr
 import aiofiles
 import asyncio
-from typing import Tuple, Optional
+import multiprocessing
+import os
+import threading
+import zipfile
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import BinaryIO, Tuple, Optional
+from ..config import settings
+
+# Extensions trusted as-is, without sniffing the content
+KNOWN_EXTENSIONS = frozenset({'pdf', 'docx', 'doc', 'png', 'jpg', 'jpeg', 'txt'})
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W_NS + 'p'
+_W_T = _W_NS + 't'
+# Run content that python-docx rendered as whitespace
+_W_BREAKS = {_W_NS + 'tab': '\t', _W_NS + 'br': '\n', _W_NS + 'cr': '\n'}
+
+PDF_OCR_MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Cheaper line-height computation in PyMuPDF's layout analysis, plenty for plain text extraction
+fitz.TOOLS.set_small_glyph_heights(True)
+
+# Process-local PaddleOCR of a PDF OCR pool worker
+_worker_ocr = None
+
+def _create_paddle_ocr():
+    """PaddleOCR configured from settings, model dirs only passed when set"""
+    from paddleocr import PaddleOCR
+    model_dirs = {
+        name: value for name, value in (
+            ('det_model_dir', settings.OCR_DET_MODEL_DIR),
+            ('rec_model_dir', settings.OCR_REC_MODEL_DIR)
+        ) if value
+    }
+    return PaddleOCR(
+        use_angle_cls=True,
+        lang='en',
+        enable_mkldnn=settings.OCR_ENABLE_MKLDNN,
+        cpu_threads=settings.OCR_CPU_THREADS,
+        precision=settings.OCR_PRECISION,
+        **model_dirs
+    )
+
+def _init_paddle():
+    """Pool initializer, loads PaddleOCR once per worker process"""
+    global _worker_ocr
+    _worker_ocr = _create_paddle_ocr()
+
+def _ocr_page(img_np: np.ndarray) -> str:
+    """OCR one rendered PDF page inside a pool worker"""
+    try:
+        return _ocr_result_text(_worker_ocr.ocr(img_np[:, :, ::-1]))
+    except Exception as e:
+        return f"OCR failed: {str(e)}"
+
+def _ocr_result_text(result) -> str:
+    """Join the recognized lines of a PaddleOCR result"""
+    text = ""
+    if result and result[0]:
+        for line in result[0]:
+            if len(line) > 1:
+                text += line[1][0] + "\n"
+    return text
+
+_pdf_ocr_pool: Optional[ProcessPoolExecutor] = None
+_pdf_ocr_pool_lock = threading.Lock()
+
+def _get_pdf_ocr_pool() -> ProcessPoolExecutor:
+    """Worker processes for scanned PDF pages, started on first use"""
+    global _pdf_ocr_pool
+    with _pdf_ocr_pool_lock:
+        if _pdf_ocr_pool is None:
+            # Spawned, not forked: the server process already runs executor, logging and OpenMP threads
+            _pdf_ocr_pool = ProcessPoolExecutor(
+                max_workers=PDF_OCR_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_paddle
+            )
+        return _pdf_ocr_pool
+
+def _discard_pdf_ocr_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next scanned PDF starts a fresh one"""
+    global _pdf_ocr_pool
+    with _pdf_ocr_pool_lock:
+        if _pdf_ocr_pool is pool:
+            _pdf_ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
 
 class TextExtractor:
     def __init__(self):
-        self.ocr = paddleocr.PaddleOCR(use_angle_cls=True, lang='en')
+        # PaddleOCR is loaded on first use, text-native documents never need it
+        self._ocr = None
+        self._ocr_lock = threading.Lock()
     
-    async def extract_text(self, file_content: bytes, filename: str) -> Tuple[str, str]:
-        """Extract text from various file formats"""
+    @property
+    def ocr(self):
+        """PaddleOCR engine, created once by whichever OCR thread gets here first"""
+        if self._ocr is None:
+            with self._ocr_lock:
+                if self._ocr is None:
+                    self._ocr = _create_paddle_ocr()
+        return self._ocr
+    
+    async def extract_text(self, file: BinaryIO, filename: str) -> Tuple[str, str]:
+        """Extract text from various file formats, reading from a file-like object"""
         try:
-            file_type = self._detect_file_type(file_content, filename)
+            file_type = self._detect_file_type(file, filename)
             
             if file_type == 'pdf':
-                return await self._extract_from_pdf(file_content)
+                # PyMuPDF needs the whole document in memory
+                return await self._extract_from_pdf(file.read())
             elif file_type in ['docx', 'doc']:
-                return await self._extract_from_docx(file_content)
+                return await self._extract_from_docx(file)
             elif file_type in ['png', 'jpg', 'jpeg']:
-                return await self._extract_from_image(file_content)
+                return await self._extract_from_image(file.read())
             elif file_type == 'txt':
-                return file_content.decode('utf-8', errors='ignore'), 'text'
+                return file.read().decode('utf-8', errors='ignore'), 'text'
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
                 
         except Exception as e:
             raise Exception(f"Text extraction failed: {str(e)}")
     
-    def _detect_file_type(self, file_content: bytes, filename: str) -> str:
-        """Detect file type using python-magic and filename"""
+    def _detect_file_type(self, file: BinaryIO, filename: str) -> str:
+        """Detect file type from the filename, or with python-magic when the extension is unknown"""
+        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        if ext in KNOWN_EXTENSIONS:
+            return ext
+        
         try:
-            mime_type = magic.from_buffer(file_content, mime=True)
+            # libmagic only needs the header
+            header = file.read(2048)
+            file.seek(0)
+            mime_type = magic.from_buffer(header, mime=True)
             
             if mime_type == 'application/pdf':
                 return 'pdf'
@@ -56,99 +163,135 @@ class TextExtractor:
     async def _extract_from_pdf(self, file_content: bytes) -> Tuple[str, str]:
         """Extract text from PDF using PyMuPDF"""
         try:
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            text = ""
-            has_text = False
-            
-            for page in doc:
-                page_text = page.get_text()
-                if page_text.strip():
-                    text += page_text + "\n"
-                    has_text = True
-            
-            doc.close()
+            # PDF parsing is CPU-bound, keep it off the event loop
+            text = await asyncio.get_running_loop().run_in_executor(
+                None, self._read_pdf_text, file_content
+            )
             
-            if not has_text or len(text.strip()) < 100:
+            if len(text) < 100:
                 # Fallback to OCR for scanned PDFs
                 return await self._extract_from_pdf_ocr(file_content)
             
-            return text.strip(), 'pdf_text'
+            return text, 'pdf_text'
             
         except Exception as e:
             # Fallback to OCR
             return await self._extract_from_pdf_ocr(file_content)
     
+    def _read_pdf_text(self, file_content: bytes) -> str:
+        """Read the embedded text blocks of every page, skipping image blocks"""
+        doc = fitz.open(stream=file_content, filetype="pdf")
+        blocks = []
+        
+        for page in doc:
+            # (x0, y0, x1, y1, text, block_no, block_type), block_type 1 is an image
+            blocks.extend(
+                block[4].strip() for block in page.get_text("blocks") if block[6] == 0
+            )
+        
+        doc.close()
+        return "\n".join(block for block in blocks if block)
+    
     async def _extract_from_pdf_ocr(self, file_content: bytes) -> Tuple[str, str]:
         """Extract text from PDF using OCR"""
         try:
             doc = fitz.open(stream=file_content, filetype="pdf")
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
+            page_arrays = []
+            for page in doc:
                 pix = page.get_pixmap()
-                img_data = pix.tobytes("png")
-                
-                # Run OCR in thread pool to avoid blocking
-                ocr_result = await asyncio.get_event_loop().run_in_executor(
-                    None, self._run_ocr, img_data
+                # Hand the raw pixels to OCR instead of a PNG round-trip
+                page_arrays.append(
+                    np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
                 )
-                text += ocr_result + "\n"
-            
             doc.close()
-            return text.strip(), 'pdf_ocr'
+            
+            # OCR every page in parallel across worker processes
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                pool = _get_pdf_ocr_pool()
+                try:
+                    results = await asyncio.gather(*[
+                        loop.run_in_executor(pool, _ocr_page, img_np) for img_np in page_arrays
+                    ])
+                    break
+                except BrokenProcessPool:
+                    # A worker died (e.g. PaddleOCR failed to load); rebuild once rather than stay broken
+                    _discard_pdf_ocr_pool(pool)
+                    if attempt:
+                        raise
+            return "\n".join(results).strip(), 'pdf_ocr'
             
         except Exception as e:
             raise Exception(f"PDF OCR extraction failed: {str(e)}")
     
-    async def _extract_from_docx(self, file_content: bytes) -> Tuple[str, str]:
+    async def _extract_from_docx(self, file: BinaryIO) -> Tuple[str, str]:
         """Extract text from DOCX files"""
         try:
-            # Try python-docx first
-            doc = docx.Document(io.BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            if text.strip():
-                return text.strip(), 'docx'
-            
-            # Fallback to mammoth for better formatting
-            with io.BytesIO(file_content) as docx_file:
-                result = mammoth.extract_raw_text(docx_file)
-                return result.value.strip(), 'docx_mammoth'
-                
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._read_docx, file
+            )
         except Exception as e:
             raise Exception(f"DOCX extraction failed: {str(e)}")
     
+    def _read_docx(self, file: BinaryIO) -> Tuple[str, str]:
+        """Read DOCX text by streaming word/document.xml, falling back to mammoth"""
+        try:
+            text = self._read_docx_xml(file)
+            if text:
+                return text, 'docx'
+        except Exception:
+            pass
+        
+        # Fallback to mammoth for better formatting
+        file.seek(0)
+        result = mammoth.extract_raw_text(file)
+        return result.value.strip(), 'docx_mammoth'
+    
+    def _read_docx_xml(self, file: BinaryIO) -> str:
+        """Paragraph text of the document body, one line per w:p, without building an object model"""
+        paragraphs = []
+        with zipfile.ZipFile(file) as archive, archive.open('word/document.xml') as xml:
+            for _, element in etree.iterparse(xml, tag=_W_P):
+                # Nested paragraphs (text boxes) are emitted by their own end event
+                paragraphs.append(''.join(
+                    (node.text or '') if node.tag == _W_T else _W_BREAKS[node.tag]
+                    for node in element.iter(_W_T, *_W_BREAKS)
+                ))
+                element.clear()
+        return '\n'.join(paragraphs).strip()
+    
     async def _extract_from_image(self, file_content: bytes) -> Tuple[str, str]:
         """Extract text from image using OCR"""
         try:
-            # Run OCR in thread pool
-            text = await asyncio.get_event_loop().run_in_executor(
-                None, self._run_ocr, file_content
+            # Decode once and run OCR in thread pool
+            text = await asyncio.get_running_loop().run_in_executor(
+                None, self._run_image_ocr, file_content
             )
             return text.strip(), 'image_ocr'
             
         except Exception as e:
             raise Exception(f"Image OCR extraction failed: {str(e)}")
     
-    def _run_ocr(self, image_data: bytes) -> str:
-        """Run OCR on image data"""
+    def _run_image_ocr(self, image_data: bytes) -> str:
+        """Decode an encoded image and run OCR on its pixels"""
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Run PaddleOCR
-            result = self.ocr.ocr(image_data)
+            img_np = np.array(Image.open(io.BytesIO(image_data)).convert('RGB'))
+        except Exception as e:
+            return f"OCR failed: {str(e)}"
+        return self._run_ocr(img_np)
+    
+    def _run_ocr(self, img_np: np.ndarray) -> str:
+        """Run OCR on an HxWx3 RGB pixel array"""
+        try:
+            # Run PaddleOCR (expects OpenCV's BGR channel order)
+            result = self.ocr.ocr(img_np[:, :, ::-1])
             
             # Extract text from OCR result
-            text = ""
-            if result and result[0]:
-                for line in result[0]:
-                    if len(line) > 1:
-                        text += line[1][0] + "\n"
-            
-            return text
+            return _ocr_result_text(result)
         except Exception as e:
-            return f"OCR failed: {str(e)}"
\ No newline at end of file
+            return f"OCR failed: {str(e)}"
+
+@lru_cache(maxsize=None)
+def get_text_extractor() -> TextExtractor:
+    """Process-wide TextExtractor shared by every request"""
+    return TextExtractor()
@@ -1,10 +1,12 @@
 import streamlit as st
-import requests
-import json
+import asyncio
+import hashlib
+import html
+import httpx
+import orjson
 import time
-from datetime import datetime
-import pandas as pd
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
 # Configure Streamlit page
 st.set_page_config(
@@ -17,6 +19,77 @@ st.set_page_config(
 # Backend configuration
 BACKEND_URL = "http://127.0.0.1:8000"
 API_BASE = f"{BACKEND_URL}/api/v1"
+JOB_TIMEOUT = 60  # 60 seconds max
+JOB_POLL_TICK = 0.1  # How often the job fragment wakes up to see whether a poll is due
+EVENT_READ_WINDOW = 1.0  # Longest a fragment run waits on a quiet event stream
+
+def _upload_part(file) -> tuple:
+    """Multipart file tuple that streams from the uploaded buffer instead of copying it"""
+    file.seek(0)
+    return (file.name, file, file.type)
+
+def _upload_bytes(file) -> bytes:
+    """The upload's bytes, copied out of the buffer once per uploaded file and reused across reruns"""
+    key = (file.name, file.size, file.file_id)
+    if st.session_state.get("buf_key") != key:
+        st.session_state.buf = file.getvalue()
+        st.session_state.buf_key = key
+    return st.session_state.buf
+
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """Pooled keep-alive HTTP client shared by every rerun and the parse pool threads"""
+    # The transport owns the pool, so limits and HTTP/2 are set on it; retries cover connect failures
+    transport = httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=4)
+    )
+    return httpx.Client(transport=transport, timeout=5.0)
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _backend_healthy(api_base: str) -> bool:
+    """Probe the backend health endpoint, reused across reruns for 10s"""
+    try:
+        response = get_http_client().get(f"{api_base}/health", timeout=2)
+        return response.status_code == 200
+    except:
+        return False
+
+@st.cache_data(
+    ttl=3600,
+    max_entries=64,
+    show_spinner=False,
+    hash_funcs={bytes: lambda b: hashlib.blake2b(b, digest_size=16).digest()}
+)
+def _cached_parse(api_base: str, file_bytes: bytes, mime: str, name: str, use_llm: bool, provider: str) -> Dict[str, Any]:
+    """POST one resume to /parse, memoized on its content hash and options; failures raise so they aren't cached"""
+    response = get_http_client().post(
+        f"{api_base}/parse",
+        files={"file": (name, file_bytes, mime)},
+        # The backend reads these as query parameters
+        params={
+            "use_llm_fallback": use_llm,
+            "llm_provider": provider
+        },
+        timeout=30
+    )
+    result = response.json()
+    if not result.get("success"):
+        raise RuntimeError(result.get("error") or result.get("detail") or "Parsing failed")
+    return result
+
+@st.cache_resource
+def get_parse_pool() -> ThreadPoolExecutor:
+    """Worker threads that run sync parses off the script thread"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def _parse_in_background(api_base: str, file_bytes: bytes, mime: str, name: str, use_llm: bool, provider: str) -> Dict[str, Any]:
+    """Run a cached sync parse on a pool thread, turning failures into an error result"""
+    try:
+        return _cached_parse(api_base, file_bytes, mime, name, use_llm, provider)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
 class ResumeParserUI:
     def __init__(self):
@@ -25,266 +98,494 @@ class ResumeParserUI:
     
     def check_backend_health(self) -> bool:
         """Check if backend is running"""
-        try:
-            response = requests.get(f"{self.api_base}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
-    
-    def parse_resume_sync(self, file, use_llm_fallback: bool = True, llm_provider: str = "openai") -> Dict[str, Any]:
-        """Parse resume synchronously"""
-        try:
-            files = {"file": (file.name, file.getvalue(), file.type)}
-            data = {
-                "use_llm_fallback": use_llm_fallback,
-                "llm_provider": llm_provider
-            }
-            
-            with st.spinner("Processing resume..."):
-                response = requests.post(
-                    f"{self.api_base}/parse",
-                    files=files,
-                    data=data,
-                    timeout=30
-                )
-            
-            return response.json()
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return _backend_healthy(self.api_base)
+    
+    def parse_resume_sync(self, file, use_llm_fallback: bool = True, llm_provider: str = "openai") -> None:
+        """Start a synchronous parse on the worker pool, collected by wait_sync_parse"""
+        # Re-parsing the same bytes with the same options is served from the cache
+        future = get_parse_pool().submit(
+            _parse_in_background,
+            self.api_base, _upload_bytes(file), file.type, file.name, use_llm_fallback, llm_provider
+        )
+        # Filed under the upload and options it was submitted with, even if those change meanwhile
+        st.session_state["sync_parse"] = {
+            "future": future,
+            "started": time.time(),
+            "file_key": _file_key([file]),
+            "options": (use_llm_fallback, llm_provider)
+        }
+    
+    def wait_sync_parse(self) -> Optional[Dict[str, Any]]:
+        """Return the sync parse result once its future is done, otherwise keep watching it in a fragment"""
+        job = st.session_state["sync_parse"]
+        if job["future"].done():
+            del st.session_state["sync_parse"]
+            return job["future"].result()
+        
+        _wait_parse_fragment(job)
+        return None
     
-    def parse_resume_async(self, file, use_llm_fallback: bool = True, llm_provider: str = "openai") -> Dict[str, Any]:
-        """Parse resume asynchronously"""
+    def parse_resume_async(self, file, use_llm_fallback: bool = True, llm_provider: str = "openai") -> Optional[Dict[str, Any]]:
+        """Submit a resume for asynchronous parsing, returns None once the job is queued"""
         try:
-            files = {"file": (file.name, file.getvalue(), file.type)}
-            data = {
+            files = {"file": _upload_part(file)}
+            # The backend reads these as query parameters
+            params = {
                 "use_llm_fallback": use_llm_fallback,
                 "llm_provider": llm_provider
             }
             
             # Submit job
-            response = requests.post(
+            response = get_http_client().post(
                 f"{self.api_base}/parse/async",
                 files=files,
-                data=data,
+                params=params,
                 timeout=10
             )
             
             result = response.json()
             if result.get("success") and result.get("job_id"):
-                return self.poll_job_status(result["job_id"])
+                # Polled by poll_job_status on this and following reruns
+                st.session_state["async_job"] = {
+                    "id": result["job_id"],
+                    "started": time.time(),
+                    "delay": 0.1,
+                    "file_key": _file_key([file]),
+                    "options": (use_llm_fallback, llm_provider)
+                }
+                return None
             else:
                 return result
                 
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def poll_job_status(self, job_id: str) -> Dict[str, Any]:
-        """Poll job status until completion"""
-        progress_bar = st.progress(0)
+    def poll_job_status(self) -> Optional[Dict[str, Any]]:
+        """Return the submitted job's result once finished, otherwise keep polling it in a fragment"""
+        job = st.session_state["async_job"]
+        if "result" in job:
+            del st.session_state["async_job"]
+            return job["result"]
+        
+        # Drawn once per full run; the fragment only writes to them when what they show changes
+        progress_bar = st.progress(job.get("last_bucket", 0) / 10)
         status_text = st.empty()
+        if job.get("last_status"):
+            status_text.text(job["last_status"])
         
-        max_attempts = 60  # 60 seconds max
-        for attempt in range(max_attempts):
-            try:
-                response = requests.get(f"{self.api_base}/job/{job_id}", timeout=5)
-                job_status = response.json()
-                
-                status = job_status.get("status", "unknown")
-                progress = min((attempt + 1) / max_attempts, 0.9)
-                
-                if status == "pending":
-                    status_text.text("⏳ Job queued, waiting to process...")
-                    progress_bar.progress(0.1)
-                elif status == "processing":
-                    status_text.text("🔄 Processing resume...")
-                    progress_bar.progress(0.5)
-                elif status == "completed":
-                    status_text.text("✅ Processing completed!")
-                    progress_bar.progress(1.0)
-                    time.sleep(0.5)  # Brief pause to show completion
-                    progress_bar.empty()
-                    status_text.empty()
-                    return {"success": True, "data": job_status.get("result")}
-                elif status == "failed":
-                    progress_bar.empty()
-                    status_text.empty()
-                    return {"success": False, "error": job_status.get("error", "Unknown error")}
-                
-                time.sleep(1)
-                
-            except Exception as e:
-                progress_bar.empty()
-                status_text.empty()
-                return {"success": False, "error": f"Status check failed: {str(e)}"}
+        _poll_job_fragment(self.api_base, job, progress_bar, status_text)
+        return None
+    
+    def parse_resume_batch(self, files: list, use_llm_fallback: bool = True, llm_provider: str = "openai") -> List[Dict[str, Any]]:
+        """Parse several resumes in one /parse/bulk request, one result per file"""
+        try:
+            files_payload = [("files", _upload_part(file)) for file in files]
+            # The backend reads these as query parameters
+            params = {
+                "use_llm_fallback": use_llm_fallback,
+                "llm_provider": llm_provider
+            }
+            
+            with st.spinner(f"Processing {len(files)} resumes..."):
+                response = get_http_client().post(
+                    f"{self.api_base}/parse/bulk",
+                    files=files_payload,
+                    params=params,
+                    timeout=30 + 10 * len(files)
+                )
+            
+            results = response.json()
+            if not isinstance(results, list):
+                error = results.get("detail") or results.get("error") or "Bulk parsing failed"
+                return [{"success": False, "error": str(error)}] * len(files)
+            return results
+        except Exception as e:
+            return [{"success": False, "error": str(e)}] * len(files)
+    
+    def parse_resumes_async(self, files: list, use_llm_fallback: bool = True, llm_provider: str = "openai") -> List[Dict[str, Any]]:
+        """Submit several resumes as async jobs and poll them all concurrently"""
+        # The backend reads these as query parameters
+        params = {
+            "use_llm_fallback": use_llm_fallback,
+            "llm_provider": llm_provider
+        }
+        
+        async def run_all():
+            async with httpx.AsyncClient(limits=httpx.Limits(max_connections=16)) as client:
+                return await asyncio.gather(*[
+                    _submit_and_poll(client, self.api_base, _upload_part(file), params)
+                    for file in files
+                ])
         
-        progress_bar.empty()
-        status_text.empty()
-        return {"success": False, "error": "Job timeout after 60 seconds"}
+        with st.spinner(f"Processing {len(files)} resumes..."):
+            return asyncio.run(run_all())
 
-def display_personal_info(personal_info: Dict[str, Any]):
-    """Display personal information section"""
-    st.subheader("👤 Personal Information")
+async def _submit_and_poll(client: httpx.AsyncClient, api_base: str, file: tuple, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Submit one async job and poll it with backoff, without blocking the other jobs"""
+    try:
+        response = await client.post(f"{api_base}/parse/async", files={"file": file}, params=params, timeout=10)
+        result = response.json()
+        if not (result.get("success") and result.get("job_id")):
+            return result
+        
+        delay = 0.1
+        deadline = time.time() + JOB_TIMEOUT
+        while time.time() < deadline:
+            response = await client.get(f"{api_base}/job/{result['job_id']}", timeout=5)
+            job_status = response.json()
+            status = job_status.get("status", "unknown")
+            if status == "completed":
+                return {"success": True, "data": job_status.get("result")}
+            if status == "failed":
+                return {"success": False, "error": job_status.get("error", "Unknown error")}
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.6, 2.0)
+        
+        return {"success": False, "error": f"Job timeout after {JOB_TIMEOUT} seconds"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def _finish_job(job: Dict[str, Any], result: Dict[str, Any]):
+    """Hand a job's final result to the next full run, which renders it"""
+    job["result"] = result
+    st.rerun()
+
+@st.fragment(run_every=0.25)
+def _wait_parse_fragment(job: Dict[str, Any]):
+    """Show elapsed time while the pool thread parses; a full rerun renders the result"""
+    if job["future"].done():
+        st.rerun()
+    st.text(f"🔄 Processing resume... {time.time() - job['started']:.0f}s")
+
+# Status line and progress shown while a job is in flight
+JOB_STATUS_DISPLAY = {
+    "pending": ("⏳ Job queued, waiting to process...", 0.1),
+    "processing": ("🔄 Processing resume...", 0.5)
+}
+
+def _job_events(api_base: str, job: Dict[str, Any]):
+    """Yield job status dicts pushed over the job's SSE stream; flags the job for polling if there is no stream"""
+    with get_http_client().stream(
+        "GET",
+        f"{api_base}/job/{job['id']}/events",
+        headers={"Accept": "text/event-stream"},
+        timeout=httpx.Timeout(5.0, read=EVENT_READ_WINDOW)
+    ) as response:
+        if response.status_code != 200:
+            job["no_events"] = True
+            return
+        for line in response.iter_lines():
+            if line.startswith("data:"):
+                yield orjson.loads(line[5:])
+
+@st.fragment(run_every=JOB_POLL_TICK)
+def _poll_job_fragment(api_base: str, job: Dict[str, Any], progress_bar, status_text):
+    """Check the job when a poll is due; only this fragment reruns while the job is in flight"""
+    def show(job_status: Dict[str, Any]):
+        status = job_status.get("status", "unknown")
+        if status == "completed":
+            _finish_job(job, {"success": True, "data": job_status.get("result")})
+        elif status == "failed":
+            _finish_job(job, {"success": False, "error": job_status.get("error", "Unknown error")})
+        
+        # Only send UI updates when the status text or 10% progress bucket changes
+        if status in JOB_STATUS_DISPLAY:
+            message, progress = JOB_STATUS_DISPLAY[status]
+            if message != job.get("last_status"):
+                status_text.text(message)
+                job["last_status"] = message
+            bucket = int(progress * 10)
+            if bucket != job.get("last_bucket", 0):
+                progress_bar.progress(bucket / 10)
+                job["last_bucket"] = bucket
+    
+    if time.time() - job["started"] > JOB_TIMEOUT:
+        _finish_job(job, {"success": False, "error": f"Job timeout after {JOB_TIMEOUT} seconds"})
+    
+    # Ticks between polls do nothing, which is how the back-off below takes effect
+    if time.time() < job.get("next_poll", 0):
+        return
     
-    col1, col2 = st.columns(2)
+    # Prefer pushed status events; a missing endpoint or dropped stream falls back to polling
+    if not job.get("no_events"):
+        try:
+            for job_status in _job_events(api_base, job):
+                show(job_status)
+        except httpx.ReadTimeout:
+            # The stream is alive but quiet; hand control back to Streamlit, the next tick listens again
+            return
+        except (httpx.HTTPError, orjson.JSONDecodeError):
+            pass
+    
+    try:
+        response = get_http_client().get(f"{api_base}/job/{job['id']}", timeout=5)
+        job_status = response.json()
+    except Exception as e:
+        _finish_job(job, {"success": False, "error": f"Status check failed: {str(e)}"})
+    
+    show(job_status)
+    
+    # Poll soon after submitting, then back off so slow jobs aren't hammered
+    job["next_poll"] = time.time() + job["delay"]
+    job["delay"] = min(job["delay"] * 1.6, 2.0)
+
+def _field(label: str, value: Any) -> str:
+    """One '<b>Label:</b> value' line for an entry grid"""
+    return f"<b>{label}:</b> {html.escape(str(value))}"
+
+def _link_field(label: str, url: str) -> str:
+    """Entry grid line whose value is a link"""
+    url = html.escape(url)
+    return f'<b>{label}:</b> <a href="{url}">{url}</a>'
+
+def _field_grid(left: List[str], right: List[str]) -> str:
+    """Two-column grid of entry fields, a single column when one side is empty, nothing when both are"""
+    left_html = "<br>".join(left)
+    right_html = "<br>".join(right)
+    if not (left_html or right_html):
+        return ""
+    if left_html and right_html:
+        return (
+            '<div style="display:grid;grid-template-columns:1fr 1fr">'
+            f"<div>{left_html}</div><div>{right_html}</div></div>"
+        )
+    return f"<div>{left_html or right_html}</div>"
+
+# Sent once per result so skill and technology chips share one stylesheet
+CHIP_STYLE = """<style>
+.chip {display:inline-block;margin:0 6px 6px 0;padding:2px 10px;border-radius:12px;background:rgba(128,128,128,0.15);font-size:0.9em}
+</style>"""
+
+def _chips(items: List[str]) -> str:
+    """Render a list of labels as inline chips"""
+    return "<div>" + "".join(f'<span class="chip">{html.escape(str(item))}</span>' for item in items) + "</div>"
+
+def _entry_markdown(*blocks: str) -> str:
+    """Join an entry's non-empty blocks into one markdown document"""
+    return "\n\n".join(block for block in blocks if block)
+
+# Pure markdown builders, memoized so reruns with unchanged data skip the string work
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_personal_info(personal_info: Dict[str, Any]) -> str:
+    left = []
+    if personal_info.get("full_name"):
+        left.append(_field("Name", personal_info["full_name"]))
+    if personal_info.get("email"):
+        left.append(_field("Email", personal_info["email"]))
+    if personal_info.get("phone"):
+        left.append(_field("Phone", personal_info["phone"]))
+    
+    right = []
+    if personal_info.get("linkedin"):
+        right.append(_link_field("LinkedIn", personal_info["linkedin"]))
+    if personal_info.get("github"):
+        right.append(_link_field("GitHub", personal_info["github"]))
+    if personal_info.get("portfolio"):
+        right.append(_link_field("Portfolio", personal_info["portfolio"]))
+    
+    return _field_grid(left, right)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_experience(exp: Dict[str, Any]) -> str:
+    left = []
+    if exp.get("position"):
+        left.append(_field("Position", exp["position"]))
+    if exp.get("company"):
+        left.append(_field("Company", exp["company"]))
+    
+    right = []
+    if exp.get("start_date"):
+        end_date = exp.get('end_date', 'Present' if exp.get('is_current') else 'Unknown')
+        right.append(_field("Duration", f"{exp['start_date']} - {end_date}"))
+    
+    description = f"**Description:**\n\n{html.escape(exp['description'])}" if exp.get("description") else ""
+    achievements = ""
+    if exp.get("achievements"):
+        achievements = "**Key Achievements:**\n\n" + "\n".join(f"- {html.escape(str(a))}" for a in exp["achievements"])
+    
+    return _entry_markdown(_field_grid(left, right), description, achievements)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_education(edu: Dict[str, Any]) -> str:
+    left = []
+    if edu.get("degree"):
+        left.append(_field("Degree", edu["degree"]))
+    if edu.get("field_of_study"):
+        left.append(_field("Field", edu["field_of_study"]))
+    
+    right = []
+    if edu.get("institution"):
+        right.append(_field("Institution", edu["institution"]))
+    if edu.get("graduation_date"):
+        right.append(_field("Graduation", edu["graduation_date"]))
+    if edu.get("gpa"):
+        right.append(_field("GPA", edu["gpa"]))
+    
+    return _field_grid(left, right)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_skills(skills: list) -> str:
+    return "".join(
+        f"<h4>{html.escape(skill_group.get('category') or 'Skills')}</h4>{_chips(skill_group['skills'])}"
+        for skill_group in skills
+        if skill_group.get("skills")
+    )
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_project(project: Dict[str, Any]) -> str:
+    description = f"**Description:**\n\n{html.escape(project['description'])}" if project.get("description") else ""
+    technologies = ""
+    if project.get("technologies"):
+        technologies = "**Technologies:**\n\n" + _chips(project["technologies"])
+    
+    left = [_link_field("URL", project["url"])] if project.get("url") else []
+    right = []
+    if project.get("start_date"):
+        end_date = project.get('end_date', 'Ongoing')
+        right.append(_field("Duration", f"{project['start_date']} - {end_date}"))
+    
+    return _entry_markdown(description, technologies, _field_grid(left, right))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_certification(cert: Dict[str, Any]) -> str:
+    left = []
+    if cert.get("issuer"):
+        left.append(_field("Issuer", cert["issuer"]))
+    if cert.get("date"):
+        left.append(_field("Date", cert["date"]))
     
-    with col1:
-        if personal_info.get("full_name"):
-            st.write(f"**Name:** {personal_info['full_name']}")
-        if personal_info.get("email"):
-            st.write(f"**Email:** {personal_info['email']}")
-        if personal_info.get("phone"):
-            st.write(f"**Phone:** {personal_info['phone']}")
+    right = [_field("Credential ID", cert["credential_id"])] if cert.get("credential_id") else []
     
-    with col2:
-        if personal_info.get("linkedin"):
-            st.write(f"**LinkedIn:** [{personal_info['linkedin']}]({personal_info['linkedin']})")
-        if personal_info.get("github"):
-            st.write(f"**GitHub:** [{personal_info['github']}]({personal_info['github']})")
-        if personal_info.get("portfolio"):
-            st.write(f"**Portfolio:** [{personal_info['portfolio']}]({personal_info['portfolio']})")
-
-def display_experience(experience: list):
+    return _field_grid(left, right)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_languages(languages: list) -> str:
+    lines = []
+    for lang in languages:
+        lang_name = lang.get("language", "Unknown")
+        proficiency = lang.get("proficiency", "")
+        lines.append(f"- **{lang_name}**: {proficiency}" if proficiency else f"- {lang_name}")
+    return "\n".join(lines)
+
+@st.cache_resource
+def get_render_pool() -> ThreadPoolExecutor:
+    """Threads that build section markdown ahead of emitting it"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def _render_sections(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build every section's markdown on the render pool; entry sections map to one block per entry"""
+    pool = get_render_pool()
+    futures = {}
+    for section, render in (
+        ("personal_info", _render_personal_info),
+        ("skills", _render_skills),
+        ("languages", _render_languages)
+    ):
+        if data.get(section):
+            futures[section] = pool.submit(render, data[section])
+    for section, render in (
+        ("experience", _render_experience),
+        ("education", _render_education),
+        ("projects", _render_project),
+        ("certifications", _render_certification)
+    ):
+        futures[section] = [pool.submit(render, entry) for entry in data.get(section) or []]
+    
+    return {
+        section: [f.result() for f in future] if isinstance(future, list) else future.result()
+        for section, future in futures.items()
+    }
+
+def display_personal_info(block: str):
+    """Display personal information section"""
+    st.subheader("👤 Personal Information")
+    st.markdown(block, unsafe_allow_html=True)
+
+def _entry_titles(data: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Expander titles for every entry, built once per parse result"""
+    return {
+        "experience": [
+            f"{exp.get('position', 'Unknown Position')} - {exp.get('company', 'Unknown Company')}"
+            for exp in data.get("experience") or []
+        ],
+        "education": [
+            f"{edu.get('degree', 'Degree')} - {edu.get('institution', 'Institution')}"
+            for edu in data.get("education") or []
+        ],
+        "projects": [f"{project.get('name', 'Unnamed Project')}" for project in data.get("projects") or []],
+        "certifications": [f"{cert.get('name', 'Certification')}" for cert in data.get("certifications") or []]
+    }
+
+def display_experience(blocks: List[str], titles: List[str]):
     """Display experience section"""
     st.subheader("💼 Work Experience")
     
-    if not experience:
+    if not blocks:
         st.info("No work experience found")
         return
     
-    for i, exp in enumerate(experience):
-        with st.expander(f"{exp.get('position', 'Unknown Position')} - {exp.get('company', 'Unknown Company')}", expanded=i == 0):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                if exp.get("position"):
-                    st.write(f"**Position:** {exp['position']}")
-                if exp.get("company"):
-                    st.write(f"**Company:** {exp['company']}")
-            
-            with col2:
-                if exp.get("start_date"):
-                    end_date = exp.get('end_date', 'Present' if exp.get('is_current') else 'Unknown')
-                    st.write(f"**Duration:** {exp['start_date']} - {end_date}")
-            
-            if exp.get("description"):
-                st.write("**Description:**")
-                st.write(exp['description'])
-            
-            if exp.get("achievements"):
-                st.write("**Key Achievements:**")
-                for achievement in exp['achievements']:
-                    st.write(f"• {achievement}")
+    # One markdown message per entry instead of a columns/write call per field
+    for i, (block, title) in enumerate(zip(blocks, titles)):
+        with st.expander(title, expanded=i == 0):
+            st.markdown(block, unsafe_allow_html=True)
 
-def display_education(education: list):
+def display_education(blocks: List[str], titles: List[str]):
     """Display education section"""
     st.subheader("🎓 Education")
     
-    if not education:
+    if not blocks:
         st.info("No education information found")
         return
     
-    for edu in education:
-        with st.expander(f"{edu.get('degree', 'Degree')} - {edu.get('institution', 'Institution')}", expanded=True):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                if edu.get("degree"):
-                    st.write(f"**Degree:** {edu['degree']}")
-                if edu.get("field_of_study"):
-                    st.write(f"**Field:** {edu['field_of_study']}")
-            
-            with col2:
-                if edu.get("institution"):
-                    st.write(f"**Institution:** {edu['institution']}")
-                if edu.get("graduation_date"):
-                    st.write(f"**Graduation:** {edu['graduation_date']}")
-                if edu.get("gpa"):
-                    st.write(f"**GPA:** {edu['gpa']}")
-
-def display_skills(skills: list):
+    for block, title in zip(blocks, titles):
+        with st.expander(title, expanded=True):
+            st.markdown(block, unsafe_allow_html=True)
+
+def display_skills(block: str):
     """Display skills section"""
     st.subheader("🛠️ Skills")
     
-    if not skills:
+    if not block:
         st.info("No skills found")
         return
     
-    for skill_group in skills:
-        category = skill_group.get("category", "Skills")
-        skill_list = skill_group.get("skills", [])
-        
-        if skill_list:
-            st.write(f"**{category}:**")
-            # Display skills as tags
-            skills_text = " • ".join(skill_list)
-            st.write(skills_text)
-            st.write("")
+    st.markdown(block, unsafe_allow_html=True)
 
-def display_projects(projects: list):
+def display_projects(blocks: List[str], titles: List[str]):
     """Display projects section"""
     st.subheader("🚀 Projects")
     
-    if not projects:
+    if not blocks:
         st.info("No projects found")
         return
     
-    for project in projects:
-        with st.expander(f"{project.get('name', 'Unnamed Project')}", expanded=False):
-            if project.get("description"):
-                st.write("**Description:**")
-                st.write(project['description'])
-            
-            if project.get("technologies"):
-                st.write("**Technologies:**")
-                tech_text = " • ".join(project['technologies'])
-                st.write(tech_text)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if project.get("url"):
-                    st.write(f"**URL:** [{project['url']}]({project['url']})")
-            with col2:
-                if project.get("start_date"):
-                    end_date = project.get('end_date', 'Ongoing')
-                    st.write(f"**Duration:** {project['start_date']} - {end_date}")
-
-def display_certifications(certifications: list):
+    for block, title in zip(blocks, titles):
+        with st.expander(title, expanded=False):
+            st.markdown(block, unsafe_allow_html=True)
+
+def display_certifications(blocks: List[str], titles: List[str]):
     """Display certifications section"""
     st.subheader("📜 Certifications")
     
-    if not certifications:
+    if not blocks:
         st.info("No certifications found")
         return
     
-    for cert in certifications:
-        with st.expander(f"{cert.get('name', 'Certification')}", expanded=False):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                if cert.get("issuer"):
-                    st.write(f"**Issuer:** {cert['issuer']}")
-                if cert.get("date"):
-                    st.write(f"**Date:** {cert['date']}")
-            
-            with col2:
-                if cert.get("credential_id"):
-                    st.write(f"**Credential ID:** {cert['credential_id']}")
+    for block, title in zip(blocks, titles):
+        with st.expander(title, expanded=False):
+            st.markdown(block, unsafe_allow_html=True)
 
-def display_languages(languages: list):
+def display_languages(block: str):
     """Display languages section"""
     st.subheader("🌐 Languages")
     
-    if not languages:
+    if not block:
         st.info("No languages found")
         return
     
-    for lang in languages:
-        lang_name = lang.get("language", "Unknown")
-        proficiency = lang.get("proficiency", "")
-        if proficiency:
-            st.write(f"• **{lang_name}**: {proficiency}")
-        else:
-            st.write(f"• {lang_name}")
+    st.markdown(block)
 
 def display_metadata(data: Dict[str, Any]):
     """Display parsing metadata"""
@@ -301,7 +602,8 @@ def display_metadata(data: Dict[str, Any]):
         method_display = {
             "rule_based": "Rule-Based",
             "llm_openai": "OpenAI GPT",
-            "llm_anthropic": "Claude"
+            "llm_anthropic": "Claude",
+            "hybrid": "Hybrid (Rule + LLM)"
         }.get(method, method.title())
         st.metric("Parsing Method", method_display)
     
@@ -314,6 +616,93 @@ def display_json_data(data: Dict[str, Any]):
     with st.expander("🔍 Raw JSON Data", expanded=False):
         st.json(data)
 
+def display_result(result: Dict[str, Any], total_time: float, key: str = "result"):
+    """Display one parse result, or its error"""
+    if result.get("success"):
+        data = result.get("data", {})
+        titles = result.get("titles") or _entry_titles(data)
+        # Markdown is built in parallel up front, then emitted below in section order
+        rendered = _render_sections(data)
+        
+        st.success(f"✅ Resume parsed successfully in {total_time:.2f}s")
+        st.markdown(CHIP_STYLE, unsafe_allow_html=True)
+        
+        # Display parsed sections
+        if data.get("personal_info"):
+            display_personal_info(rendered["personal_info"])
+        
+        if data.get("summary"):
+            st.subheader("📋 Summary")
+            st.write(data["summary"])
+        
+        if data.get("experience"):
+            display_experience(rendered["experience"], titles["experience"])
+        
+        if data.get("education"):
+            display_education(rendered["education"], titles["education"])
+        
+        if data.get("skills"):
+            display_skills(rendered["skills"])
+        
+        if data.get("projects"):
+            display_projects(rendered["projects"], titles["projects"])
+        
+        if data.get("certifications"):
+            display_certifications(rendered["certifications"], titles["certifications"])
+        
+        if data.get("languages"):
+            display_languages(rendered["languages"])
+        
+        # Metadata
+        display_metadata(data)
+        
+        # Raw JSON
+        display_json_data(data)
+        
+        # Download option
+        from datetime import datetime
+        st.header("💾 Export Results")
+        json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        st.download_button(
+            label="📥 Download JSON",
+            key=f"download_{key}",
+            data=json_bytes,
+            file_name=f"parsed_resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+        
+    else:
+        error_msg = result.get("error", "Unknown error occurred")
+        st.error(f"❌ Parsing failed: {error_msg}")
+
+def _file_key(files: list) -> tuple:
+    """Identity of a set of uploads, used to match stored results to what is uploaded now"""
+    return tuple((f.name, f.size) for f in files)
+
+def _remember_results(file_key: tuple, options: tuple, results: List[Dict[str, Any]], total_time: float):
+    """Keep the latest parse results in session state, keyed by the uploads they came from"""
+    # Titles ride next to the data so reruns don't rebuild them and the exported JSON stays clean
+    for result in results:
+        if result.get("success"):
+            result["titles"] = _entry_titles(result.get("data") or {})
+    
+    st.session_state.last_result = {
+        "file_key": file_key,
+        "options": options,
+        "results": results,
+        "total_time": total_time
+    }
+
+def _has_last_results(file_key: tuple, options: tuple) -> bool:
+    """Whether the stored results already cover these uploads and options without failures"""
+    last = st.session_state.last_result
+    return bool(
+        last
+        and last["file_key"] == file_key
+        and last["options"] == options
+        and all(result.get("success") for result in last["results"])
+    )
+
 def main():
     # Title and header
     st.title("📄 Resume Parser")
@@ -332,35 +721,46 @@ def main():
     else:
         st.sidebar.success("✅ Backend connected")
     
-    # Processing options
-    st.sidebar.subheader("Processing Options")
-    processing_mode = st.sidebar.radio(
-        "Processing Mode",
-        ["Synchronous", "Asynchronous"],
-        help="Synchronous: Wait for result. Asynchronous: Submit job and poll status."
-    )
+    # Processing options, applied together so editing them doesn't rerun the page per widget
+    with st.sidebar.form("config"):
+        st.subheader("Processing Options")
+        processing_mode = st.radio(
+            "Processing Mode",
+            ["Synchronous", "Asynchronous"],
+            help="Synchronous: Wait for result. Asynchronous: Submit job and poll status."
+        )
+        
+        use_llm_fallback = st.checkbox(
+            "Use LLM Fallback",
+            value=True,
+            help="Use AI models when rule-based parsing confidence is low"
+        )
+        
+        llm_provider = st.selectbox(
+            "LLM Provider",
+            ["openai", "anthropic"],
+            help="Choose AI provider for fallback parsing"
+        )
+        
+        st.form_submit_button("Apply")
     
-    use_llm_fallback = st.sidebar.checkbox(
-        "Use LLM Fallback",
-        value=True,
-        help="Use AI models when rule-based parsing confidence is low"
-    )
+    options = (use_llm_fallback, llm_provider)
     
-    llm_provider = st.sidebar.selectbox(
-        "LLM Provider",
-        ["openai", "anthropic"],
-        help="Choose AI provider for fallback parsing"
-    )
+    # Last results survive reruns, so widget changes after a parse don't clear or refetch them
+    st.session_state.setdefault("last_result", None)
     
     # File upload
     st.header("📤 Upload Resume")
-    uploaded_file = st.file_uploader(
-        "Choose a resume file",
+    uploaded_files = st.file_uploader(
+        "Choose resume files",
         type=['pdf', 'docx', 'doc', 'txt', 'png', 'jpg', 'jpeg'],
+        accept_multiple_files=True,
         help="Supported formats: PDF, DOCX, DOC, TXT, PNG, JPG, JPEG"
     )
     
-    if uploaded_file is not None:
+    if len(uploaded_files) == 1:
+        uploaded_file = uploaded_files[0]
+        
         # File information
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -370,13 +770,17 @@ def main():
         with col3:
             st.info(f"**Type:** {uploaded_file.type}")
         
+        file_key = _file_key(uploaded_files)
+        
         # Parse button
-        if st.button("🚀 Parse Resume", type="primary"):
+        result = None
+        result_key, result_options = file_key, options
+        if st.button("🚀 Parse Resume", type="primary") and not _has_last_results(file_key, options):
             start_time = time.time()
             
             # Choose processing mode
             if processing_mode == "Synchronous":
-                result = parser_ui.parse_resume_sync(
+                parser_ui.parse_resume_sync(
                     uploaded_file, use_llm_fallback, llm_provider
                 )
             else:
@@ -385,58 +789,53 @@ def main():
                 )
             
             total_time = time.time() - start_time
+        
+        # A sync parse runs on the worker pool and is watched by its own fragment
+        if result is None and "sync_parse" in st.session_state:
+            job = st.session_state["sync_parse"]
+            start_time = job["started"]
+            result_key, result_options = job["file_key"], job["options"]
+            result = parser_ui.wait_sync_parse()
+            total_time = time.time() - start_time
+        
+        # A submitted job is polled in its own fragment until its result comes back here
+        if result is None and "async_job" in st.session_state:
+            job = st.session_state["async_job"]
+            start_time = job["started"]
+            result_key, result_options = job["file_key"], job["options"]
+            result = parser_ui.poll_job_status()
+            total_time = time.time() - start_time
+        
+        if result is not None:
+            _remember_results(result_key, result_options, [result], total_time)
+        
+        last = st.session_state.last_result
+        if last and last["file_key"] == file_key:
+            display_result(last["results"][0], last["total_time"])
+    
+    elif uploaded_files:
+        # File information
+        st.info(f"**{len(uploaded_files)} files:** " + ", ".join(f.name for f in uploaded_files))
+        
+        file_key = _file_key(uploaded_files)
+        
+        if st.button("🚀 Parse Resumes", type="primary") and not _has_last_results(file_key, options):
+            start_time = time.time()
             
-            # Display results
-            if result.get("success"):
-                data = result.get("data", {})
-                
-                st.success(f"✅ Resume parsed successfully in {total_time:.2f}s")
-                
-                # Display parsed sections
-                if data.get("personal_info"):
-                    display_personal_info(data["personal_info"])
-                
-                if data.get("summary"):
-                    st.subheader("📋 Summary")
-                    st.write(data["summary"])
-                
-                if data.get("experience"):
-                    display_experience(data["experience"])
-                
-                if data.get("education"):
-                    display_education(data["education"])
-                
-                if data.get("skills"):
-                    display_skills(data["skills"])
-                
-                if data.get("projects"):
-                    display_projects(data["projects"])
-                
-                if data.get("certifications"):
-                    display_certifications(data["certifications"])
-                
-                if data.get("languages"):
-                    display_languages(data["languages"])
-                
-                # Metadata
-                display_metadata(data)
-                
-                # Raw JSON
-                display_json_data(data)
-                
-                # Download option
-                st.header("💾 Export Results")
-                json_str = json.dumps(data, indent=2, ensure_ascii=False)
-                st.download_button(
-                    label="📥 Download JSON",
-                    data=json_str,
-                    file_name=f"parsed_resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
-                )
-                
+            if processing_mode == "Synchronous":
+                # One round trip for the whole batch, split back into per-file results
+                results = parser_ui.parse_resume_batch(uploaded_files, use_llm_fallback, llm_provider)
             else:
-                error_msg = result.get("error", "Unknown error occurred")
-                st.error(f"❌ Parsing failed: {error_msg}")
+                # Jobs are submitted and polled concurrently, total wait is the slowest job
+                results = parser_ui.parse_resumes_async(uploaded_files, use_llm_fallback, llm_provider)
+            
+            _remember_results(file_key, options, results, time.time() - start_time)
+        
+        last = st.session_state.last_result
+        if last and last["file_key"] == file_key:
+            for i, (uploaded_file, result) in enumerate(zip(uploaded_files, last["results"])):
+                st.header(f"📄 {uploaded_file.name}")
+                display_result(result, last["total_time"], key=str(i))
     
     # Footer
     st.markdown("---")